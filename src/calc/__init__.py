@@ -1,12 +1,38 @@
+import sys
+
 from .calculator import Calculator
+from .batch import BatchCalculator, BatchResult
+from .session import CalculatorSession
+from . import kernel
+from .metrics import stats
 
-__all__ = ['Calculator']
+__all__ = ['Calculator', 'BatchCalculator', 'BatchResult', 'CalculatorSession', 'kernel', 'stats']
 
-def main() -> None:
+def main(argv=None) -> None:
+    """The ``calc`` command; ``calc serve`` runs the network server."""
+    args = sys.argv[1:] if argv is None else list(argv)
+    if args and args[0] == 'serve':
+        from .server import serve_main
+        raise SystemExit(serve_main(args[1:]))
     print("Hello from calc!")
 
-def mycalc() -> None:
+def _start_metrics(path, interval) -> None:
+    import atexit
+    from . import metrics
+
+    metrics.start_exporter(path, interval=interval)
+    atexit.register(metrics.stop_exporter)
+
+def mycalc(argv=None) -> None:
     """Interactive calculator demo."""
+    from .cli import COMMAND_MAP, batch_main, build_parser
+
+    args = build_parser().parse_args(argv)
+    if args.metrics:
+        _start_metrics(args.metrics, args.metrics_interval)
+    if args.batch is not None:
+        raise SystemExit(batch_main(args))
+
     from difflib import get_close_matches
     
     calc = Calculator()
@@ -14,37 +40,8 @@ def mycalc() -> None:
     print("=========================")
     print("Type 'help' for commands, 'exit' to quit")
     
-    # Command aliases dictionary
-    aliases = {
-        'add': ['add', 'addition', 'plus', 'sum', '+'],
-        'sub': ['sub', 'subtract', 'subtraction', 'substract', 'minus', 'difference', '-'],
-        'mul': ['mul', 'multiply', 'multiplication', 'product', '*', 'times'],
-        'div': ['div', 'divide', 'division', 'quotient', '/'],
-        'sqrt': ['sqrt', 'squareroot', 'square_root', 'root'],
-        'sin': ['sin', 'sine'],
-        'cos': ['cos', 'cosine'],
-        'tan': ['tan', 'tangent'],
-        'log': ['log', 'log10', 'logarithm'],
-        'ln': ['ln', 'natural_log', 'loge'],
-        'fact': ['fact', 'factorial', '!'],
-        'result': ['result', 'ans', 'answer'],
-        'clear': ['clear', 'clr', 'reset'],
-        'm+': ['m+', 'memory_add', 'memory+'],
-        'm-': ['m-', 'memory_subtract', 'memory-'],
-        'mr': ['mr', 'memory_recall', 'recall'],
-        'mc': ['mc', 'memory_clear', 'clearmem'],
-        'exit': ['exit', 'quit', 'bye', 'q'],
-        'help': ['help', 'h', '?', 'commands']
-    }
-    
-    # Flatten aliases for lookup
-    command_map = {}
-    for main_cmd, alias_list in aliases.items():
-        for alias in alias_list:
-            command_map[alias] = main_cmd
-    
     # All valid commands
-    all_commands = list(command_map.keys())
+    all_commands = list(COMMAND_MAP.keys())
     
     while True:
         command_input = input("\nEnter command: ").strip().lower()
@@ -58,8 +55,8 @@ def mycalc() -> None:
         cmd = parts[0]
         
         # Look for exact match or suggest alternatives
-        if cmd in command_map:
-            main_cmd = command_map[cmd]
+        if cmd in COMMAND_MAP:
+            main_cmd = COMMAND_MAP[cmd]
             
             if main_cmd == 'exit':
                 break
@@ -76,6 +73,7 @@ def mycalc() -> None:
                 print("  log X      - Log base 10 of X (Example: log 100)")
                 print("  ln X       - Natural log of X (Example: ln 2.71)")
                 print("  fact X     - Factorial of X (Example: fact 5)")
+                print("  lfact X    - Natural log of X! (Example: lfact 1000000)")
                 print("  result     - Show current result")
                 print("  clear      - Clear current result")
                 print("  m+         - Add result to memory")
@@ -127,7 +125,7 @@ def mycalc() -> None:
                             result = calc.divide(a, b)
                             print(f"{a} / {b} = {result}")
                     
-                    elif main_cmd in ['sqrt', 'sin', 'cos', 'tan', 'log', 'ln', 'fact']:
+                    elif main_cmd in ['sqrt', 'sin', 'cos', 'tan', 'log', 'ln', 'fact', 'lfact']:
                         if len(parts) < 2:
                             print(f"Error: {main_cmd} requires one number")
                             print(f"Example: {main_cmd} 10")
@@ -156,6 +154,9 @@ def mycalc() -> None:
                         elif main_cmd == 'fact':
                             result = calc.factorial(int(a))
                             print(f"{int(a)}! = {result}")
+                        elif main_cmd == 'lfact':
+                            result = calc.log_factorial(int(a))
+                            print(f"ln({int(a)}!) = {result}")
                 
                 except ValueError as e:
                     print(f"Error: {e}")
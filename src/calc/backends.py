@@ -0,0 +1,282 @@
+"""
+Numeric backends for Calculator.
+
+A backend supplies the raw arithmetic and transcendental kernels; Calculator
+keeps the domain checks and the last_result/memory bookkeeping.  Two backends
+are available:
+
+``float``
+    Python floats and the ``math`` module (the default).
+``decimal``
+    ``decimal.Decimal`` at a configurable precision.  Square root, ``ln``,
+    ``log10`` and ``exp`` use libmpdec's correctly rounded kernels (Newton
+    iteration with argument reduction); sine, cosine and tangent reduce the
+    argument modulo pi/2, shrink it with the triple-angle identity and sum a
+    short Taylor series.  pi (Chudnovsky) and e are computed by binary
+    splitting and cached per precision.
+
+Example::
+
+    calc = Calculator(backend="decimal", precision=60)
+    calc.square_root(2)
+"""
+import decimal
+import math
+import operator
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Tuple, Union
+
+Number = Union[int, float, Decimal]
+
+
+class FloatBackend:
+    """IEEE double precision using the math module."""
+
+    name = "float"
+    precision = 17
+
+    # Builtins stored as plain class attributes are not bound as methods,
+    # so calls dispatch straight into C.
+    add = operator.add
+    subtract = operator.sub
+    multiply = operator.mul
+    divide = operator.truediv
+    power = operator.pow
+    modulo = operator.mod
+    sqrt = math.sqrt
+    ln = math.log
+    log10 = math.log10
+    exp = math.exp
+    sin = math.sin
+    cos = math.cos
+    tan = math.tan
+
+    pi = math.pi
+    e = math.e
+
+    @staticmethod
+    def convert(x: Any) -> Number:
+        """Return x as an operand for this backend."""
+        if isinstance(x, str):
+            return float(x)
+        return x
+
+    @staticmethod
+    def from_int(n: int) -> Number:
+        """An integer result as a float, or the exact int if it is too large."""
+        if n.bit_length() <= 1024:
+            return float(n)
+        return n
+
+    def __repr__(self) -> str:
+        return "FloatBackend()"
+
+
+# Chudnovsky series constants
+_C3_OVER_24 = 640320 ** 3 // 24
+
+
+def _chudnovsky(a: int, b: int) -> Tuple[int, int, int]:
+    """Binary splitting of the Chudnovsky series terms a..b-1."""
+    if b - a == 1:
+        if a == 0:
+            p = q = 1
+        else:
+            p = (6 * a - 5) * (2 * a - 1) * (6 * a - 1)
+            q = a * a * a * _C3_OVER_24
+        t = p * (13591409 + 545140134 * a)
+        if a & 1:
+            t = -t
+        return p, q, t
+    m = (a + b) // 2
+    p1, q1, t1 = _chudnovsky(a, m)
+    p2, q2, t2 = _chudnovsky(m, b)
+    return p1 * p2, q1 * q2, q2 * t1 + p1 * t2
+
+
+def _exp_series(a: int, b: int) -> Tuple[int, int]:
+    """Binary splitting of sum 1/((a+1)(a+2)...k) for k in a+1..b."""
+    if b - a == 1:
+        return 1, b
+    m = (a + b) // 2
+    p1, q1 = _exp_series(a, m)
+    p2, q2 = _exp_series(m, b)
+    return p1 * q2 + p2, q1 * q2
+
+
+def _context(prec: int) -> decimal.Context:
+    return decimal.Context(prec=prec, rounding=decimal.ROUND_HALF_EVEN,
+                           Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN,
+                           traps=[decimal.InvalidOperation, decimal.DivisionByZero,
+                                  decimal.Overflow])
+
+
+@lru_cache(maxsize=32)
+def decimal_pi(prec: int) -> Decimal:
+    """pi to prec significant digits (Chudnovsky, binary splitting)."""
+    ctx = _context(prec + 10)
+    terms = prec // 14 + 2
+    _, q, t = _chudnovsky(0, terms)
+    pi = ctx.divide(ctx.multiply(426880 * q, ctx.sqrt(10005)), t)
+    return _context(prec).plus(pi)
+
+
+@lru_cache(maxsize=32)
+def decimal_e(prec: int) -> Decimal:
+    """e to prec significant digits (Taylor series, binary splitting)."""
+    ctx = _context(prec + 10)
+    # Smallest n with n! > 10**(prec + 10)
+    n, log_fact = 1, 0.0
+    while log_fact < prec + 10:
+        n += 1
+        log_fact += math.log10(n)
+    p, q = _exp_series(0, n)
+    return _context(prec).plus(ctx.add(1, ctx.divide(p, q)))
+
+
+class DecimalBackend:
+    """Arbitrary precision decimal arithmetic."""
+
+    name = "decimal"
+
+    def __init__(self, precision: int = 50) -> None:
+        if precision < 1:
+            raise ValueError("Precision must be a positive number of digits")
+        self.precision = precision
+        self.context = _context(precision)
+
+    def __repr__(self) -> str:
+        return f"DecimalBackend(precision={self.precision})"
+
+    @property
+    def pi(self) -> Decimal:
+        return decimal_pi(self.precision)
+
+    @property
+    def e(self) -> Decimal:
+        return decimal_e(self.precision)
+
+    def convert(self, x: Any) -> Decimal:
+        """Return x as a Decimal rounded to the backend precision.
+
+        Floats are converted through their shortest repr, so ``0.1`` becomes
+        ``Decimal('0.1')`` rather than its binary expansion.
+        """
+        if isinstance(x, float):
+            x = repr(x)
+        return self.context.create_decimal(x)
+
+    def from_int(self, n: int) -> Decimal:
+        """An integer result rounded to the backend precision.
+
+        Huge integers are rounded from their leading bits only; converting
+        all of a million-digit int to Decimal would take seconds.
+        """
+        shift = n.bit_length() - (4 * self.precision + 64)
+        if shift <= 0:
+            return self.context.create_decimal(n)
+        ctx = _context(self.precision + 10)
+        value = ctx.multiply(ctx.create_decimal(n >> shift), ctx.power(2, shift))
+        return self.context.plus(value)
+
+    def add(self, a: Number, b: Number) -> Decimal:
+        return self.context.add(self.convert(a), self.convert(b))
+
+    def subtract(self, a: Number, b: Number) -> Decimal:
+        return self.context.subtract(self.convert(a), self.convert(b))
+
+    def multiply(self, a: Number, b: Number) -> Decimal:
+        return self.context.multiply(self.convert(a), self.convert(b))
+
+    def divide(self, a: Number, b: Number) -> Decimal:
+        return self.context.divide(self.convert(a), self.convert(b))
+
+    def power(self, a: Number, b: Number) -> Decimal:
+        return self.context.power(self.convert(a), self.convert(b))
+
+    def modulo(self, a: Number, b: Number) -> Decimal:
+        """Remainder with the sign of the divisor, like float %."""
+        a, b = self.convert(a), self.convert(b)
+        r = self.context.remainder(a, b)
+        if r and (r < 0) != (b < 0):
+            r = self.context.add(r, b)
+        return r
+
+    def sqrt(self, a: Number) -> Decimal:
+        return self.context.sqrt(self.convert(a))
+
+    def ln(self, a: Number) -> Decimal:
+        return self.context.ln(self.convert(a))
+
+    def log10(self, a: Number) -> Decimal:
+        return self.context.log10(self.convert(a))
+
+    def exp(self, a: Number) -> Decimal:
+        return self.context.exp(self.convert(a))
+
+    def sin(self, a: Number) -> Decimal:
+        s, c, k = self._reduced_sin_cos(self.convert(a))
+        return self.context.plus((s, c, s.copy_negate(), c.copy_negate())[k])
+
+    def cos(self, a: Number) -> Decimal:
+        s, c, k = self._reduced_sin_cos(self.convert(a))
+        return self.context.plus((c, s.copy_negate(), c.copy_negate(), s)[k])
+
+    def tan(self, a: Number) -> Decimal:
+        s, c, k = self._reduced_sin_cos(self.convert(a))
+        if k & 1:
+            s, c = c, s.copy_negate()
+        return self.context.divide(s, c)
+
+    def _reduced_sin_cos(self, x: Decimal) -> Tuple[Decimal, Decimal, int]:
+        """Return (sin r, cos r, k mod 4) where x = r + k*pi/2, |r| <= pi/4."""
+        if not x.is_finite():
+            raise ValueError("math domain error")
+        # Reducing a large argument cancels its integer digits, so carry them
+        # as extra working precision.
+        magnitude = max(x.adjusted(), 0)
+        triplings = max(int(math.sqrt(self.precision)) // 2, 1)
+        prec = self.precision + magnitude + triplings + 10
+        ctx = _context(prec)
+        half_pi = ctx.divide(decimal_pi(prec), 2)
+        k = int(ctx.divide(x, half_pi).to_integral_value(rounding=decimal.ROUND_HALF_EVEN))
+        r = ctx.subtract(x, ctx.multiply(k, half_pi))
+        s = self._sin_small(ctx, r, triplings)
+        c = ctx.sqrt(ctx.subtract(1, ctx.multiply(s, s)))
+        return s, c, k % 4
+
+    @staticmethod
+    def _sin_small(ctx: decimal.Context, r: Decimal, triplings: int) -> Decimal:
+        """sin(r) for |r| <= pi/4 via sin(3t) = 3 sin t - 4 sin^3 t."""
+        if not r:
+            return r
+        t = ctx.divide(r, 3 ** triplings)
+        t2 = ctx.multiply(t, t)
+        term = total = t
+        epsilon = t.copy_abs().scaleb(-(ctx.prec + 2), ctx)
+        n = 1
+        while term.copy_abs() > epsilon:
+            term = ctx.divide(ctx.multiply(term.copy_negate(), t2), (n + 1) * (n + 2))
+            total = ctx.add(total, term)
+            n += 2
+        for _ in range(triplings):
+            total = ctx.subtract(ctx.multiply(3, total), ctx.multiply(4, ctx.power(total, 3)))
+        return total
+
+
+_BACKENDS: Dict[str, Any] = {"float": FloatBackend, "decimal": DecimalBackend}
+_FLOAT = FloatBackend()
+
+
+def get_backend(name: Union[str, Any] = "float", precision: Union[int, None] = None):
+    """Return a backend instance by name ("float" or "decimal")."""
+    if not isinstance(name, str):
+        return name  # already a backend object
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown numeric backend: {name!r} (expected one of {sorted(_BACKENDS)})")
+    if name == "float":
+        if precision is not None:
+            raise ValueError("The float backend has a fixed precision")
+        return _FLOAT
+    return DecimalBackend(50 if precision is None else precision)
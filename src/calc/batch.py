@@ -0,0 +1,228 @@
+import math
+import operator
+from array import array
+from typing import Any, Callable, NamedTuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to array.array loops
+    np = None
+
+
+# Largest n whose factorial still fits in a float
+_MAX_FLOAT_FACTORIAL = 170
+_FACTORIAL_TABLE = [float(math.factorial(n)) for n in range(_MAX_FLOAT_FACTORIAL + 1)]
+
+
+class BatchResult(NamedTuple):
+    """Values of a batch operation plus a per-element error mask.
+
+    Elements that would have raised in the scalar ``Calculator`` API
+    (division by zero, square root of a negative number, logarithm of a
+    non-positive number, ...) are ``nan`` in ``values`` and set in ``errors``.
+    """
+    values: Any
+    errors: Any
+
+    @property
+    def error_count(self) -> int:
+        """Number of elements that failed."""
+        return int(sum(self.errors))
+
+
+def _pure_factorial(n: float) -> float:
+    if n < 0 or n != int(n):
+        raise ValueError("Factorial requires a non-negative integer")
+    if n > _MAX_FLOAT_FACTORIAL:
+        raise OverflowError("Factorial result too large for a float")
+    return _FACTORIAL_TABLE[int(n)]
+
+
+class BatchCalculator:
+    """
+    Stateless column-at-a-time versions of the Calculator operations.
+
+    Operands may be NumPy arrays, ``array.array`` objects, any other
+    buffer-protocol or plain sequence, or scalars (which are broadcast).
+    With NumPy installed the whole column is computed in C; without it a
+    tight ``array.array`` loop is used instead.  Unlike ``Calculator``, batch
+    operations never touch ``last_result``.
+    """
+
+    def __init__(self, use_numpy: bool = True) -> None:
+        self.use_numpy = use_numpy and np is not None
+
+    # Basic arithmetic
+    def add(self, a, b) -> BatchResult:
+        """Element-wise a + b."""
+        if self.use_numpy:
+            a, b = self._arrays(a, b)
+            with np.errstate(all="ignore"):
+                values = np.add(a, b)
+            return BatchResult(values, np.zeros(values.shape, dtype=bool))
+        return self._pure_binary(operator.add, a, b)
+
+    def subtract(self, a, b) -> BatchResult:
+        """Element-wise a - b."""
+        if self.use_numpy:
+            a, b = self._arrays(a, b)
+            with np.errstate(all="ignore"):
+                values = np.subtract(a, b)
+            return BatchResult(values, np.zeros(values.shape, dtype=bool))
+        return self._pure_binary(operator.sub, a, b)
+
+    def multiply(self, a, b) -> BatchResult:
+        """Element-wise a * b."""
+        if self.use_numpy:
+            a, b = self._arrays(a, b)
+            with np.errstate(all="ignore"):
+                values = np.multiply(a, b)
+            return BatchResult(values, np.zeros(values.shape, dtype=bool))
+        return self._pure_binary(operator.mul, a, b)
+
+    def divide(self, a, b) -> BatchResult:
+        """Element-wise a / b; zero divisors are flagged."""
+        if self.use_numpy:
+            a, b = self._arrays(a, b)
+            with np.errstate(all="ignore"):
+                values = np.divide(a, b)
+            return self._finish(values, b == 0)
+        return self._pure_binary(operator.truediv, a, b)
+
+    def power(self, a, b) -> BatchResult:
+        """Element-wise a ** b; overflow and complex results are flagged."""
+        if self.use_numpy:
+            a, b = self._arrays(a, b)
+            with np.errstate(all="ignore"):
+                values = np.power(a, b)
+                finite_in = np.isfinite(a) & np.isfinite(b)
+                bad = finite_in & ~np.isfinite(values)
+            return self._finish(values, bad)
+        return self._pure_binary(math.pow, a, b)
+
+    def modulo(self, a, b) -> BatchResult:
+        """Element-wise a % b; zero divisors are flagged."""
+        if self.use_numpy:
+            a, b = self._arrays(a, b)
+            with np.errstate(all="ignore"):
+                values = np.mod(a, b)
+            return self._finish(values, b == 0)
+        return self._pure_binary(operator.mod, a, b)
+
+    # Scientific functions
+    def square_root(self, a) -> BatchResult:
+        """Element-wise square root; negative inputs are flagged."""
+        if self.use_numpy:
+            a = self._array(a)
+            with np.errstate(all="ignore"):
+                values = np.sqrt(a)
+            return self._finish(values, a < 0)
+        return self._pure_unary(math.sqrt, a)
+
+    def sin(self, a) -> BatchResult:
+        """Element-wise sine of angles in radians."""
+        return self._trig(np.sin if self.use_numpy else math.sin, a)
+
+    def cos(self, a) -> BatchResult:
+        """Element-wise cosine of angles in radians."""
+        return self._trig(np.cos if self.use_numpy else math.cos, a)
+
+    def tan(self, a) -> BatchResult:
+        """Element-wise tangent of angles in radians."""
+        return self._trig(np.tan if self.use_numpy else math.tan, a)
+
+    def log10(self, a) -> BatchResult:
+        """Element-wise base-10 logarithm; non-positive inputs are flagged."""
+        if self.use_numpy:
+            a = self._array(a)
+            with np.errstate(all="ignore"):
+                values = np.log10(a)
+            return self._finish(values, a <= 0)
+        return self._pure_unary(math.log10, a)
+
+    def ln(self, a) -> BatchResult:
+        """Element-wise natural logarithm; non-positive inputs are flagged."""
+        if self.use_numpy:
+            a = self._array(a)
+            with np.errstate(all="ignore"):
+                values = np.log(a)
+            return self._finish(values, a <= 0)
+        return self._pure_unary(math.log, a)
+
+    def factorial(self, a) -> BatchResult:
+        """Element-wise factorial as floats; non-integers and overflow are flagged."""
+        if self.use_numpy:
+            a = self._array(a)
+            with np.errstate(all="ignore"):
+                valid = (a >= 0) & (a <= _MAX_FLOAT_FACTORIAL) & (a == np.floor(a))
+                index = np.where(valid, a, 0).astype(np.intp)
+            values = np.asarray(_FACTORIAL_TABLE)[index]
+            return self._finish(values, ~valid)
+        return self._pure_unary(_pure_factorial, a)
+
+    # Helpers
+    def _trig(self, func: Callable, a) -> BatchResult:
+        if self.use_numpy:
+            a = self._array(a)
+            with np.errstate(all="ignore"):
+                values = func(a)
+            return self._finish(values, np.isinf(a))
+        return self._pure_unary(func, a)
+
+    @staticmethod
+    def _array(a):
+        return np.asarray(a, dtype=np.float64)
+
+    @staticmethod
+    def _arrays(a, b):
+        return np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+
+    @staticmethod
+    def _finish(values, bad) -> BatchResult:
+        errors = np.broadcast_to(bad, values.shape).copy()
+        if errors.any():
+            values[errors] = np.nan
+        return BatchResult(values, errors)
+
+    @staticmethod
+    def _sequence(x):
+        if isinstance(x, (int, float)):
+            return None
+        return x
+
+    def _pure_binary(self, func: Callable, a, b) -> BatchResult:
+        sa, sb = self._sequence(a), self._sequence(b)
+        if sa is None and sb is None:
+            return self._pure_unary(lambda x: func(x, b), [a])
+        if sa is None:
+            return self._pure_map(lambda y: func(a, y), sb)
+        if sb is None:
+            return self._pure_map(lambda x: func(x, b), sa)
+        if len(sa) != len(sb):
+            raise ValueError("Operand arrays must have the same length")
+        return self._pure_map(func, sa, sb)
+
+    def _pure_unary(self, func: Callable, a) -> BatchResult:
+        seq = self._sequence(a)
+        return self._pure_map(func, [a] if seq is None else seq)
+
+    @staticmethod
+    def _pure_map(func: Callable, *columns) -> BatchResult:
+        # Fast path: a single C-level map over the whole column.  Only when an
+        # element raises do we redo the column one element at a time.
+        try:
+            values = array("d", map(func, *columns))
+            return BatchResult(values, array("B", bytes(len(values))))
+        except (ArithmeticError, ValueError, TypeError):
+            pass
+        values = array("d")
+        errors = array("B")
+        append_value, append_error = values.append, errors.append
+        for args in zip(*columns):
+            try:
+                append_value(func(*args))
+                append_error(0)
+            except (ArithmeticError, ValueError, TypeError):
+                append_value(math.nan)
+                append_error(1)
+        return BatchResult(values, errors)
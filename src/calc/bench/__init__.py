@@ -0,0 +1,180 @@
+"""
+Performance benchmarks with regression baselines.
+
+Three levels are measured, each as a list of named cases (see ``suites``):
+
+* ``calculator.*`` -- every Calculator method on its own;
+* ``mycalc.*``     -- the command dispatch of ``mycalc``, interactive and
+  ``--batch``, fed from an in-memory script;
+* ``gui.*``        -- CalculatorGUI event handlers, driven without a window.
+
+Each case records throughput, latency percentiles and peak traced memory.
+Results are saved as a JSON baseline and later runs are compared against
+it::
+
+    python -m calc.bench run --output baseline.json
+    python -m calc.bench compare baseline.json --threshold 0.15
+"""
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# A case: (name, function performing `ops` operations per call, ops)
+Case = Tuple[str, Callable[[], object], int]
+
+BASELINE_VERSION = 1
+
+
+class BenchResult(NamedTuple):
+    """Measurements of one benchmark case."""
+    name: str
+    ops_per_sec: float
+    p50_us: float
+    p90_us: float
+    p99_us: float
+    peak_kib: float
+    samples: int
+
+    def format(self) -> str:
+        return (f"{self.name:<32} {self.ops_per_sec:>14,.0f} ops/s  "
+                f"p50 {self.p50_us:>9.3f}us  p99 {self.p99_us:>9.3f}us  "
+                f"peak {self.peak_kib:>9.1f}KiB")
+
+
+class Regression(NamedTuple):
+    """A metric of one case that got worse than the baseline allows."""
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change, positive meaning worse."""
+        if self.metric == "ops_per_sec":
+            return 1 - self.current / self.baseline
+        return self.current / self.baseline - 1
+
+    def format(self) -> str:
+        return (f"{self.name}: {self.metric} {self.baseline:,.3f} -> {self.current:,.3f} "
+                f"({self.change:+.1%} worse)")
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def measure(name: str, func: Callable[[], object], ops: int = 1, duration: float = 0.2,
+            inner: Optional[int] = None) -> BenchResult:
+    """Benchmark func, which performs ops operations per call.
+
+    Calls are timed in groups of inner calls so the timer does not dominate
+    nanosecond operations; latencies are per operation.  Peak memory comes
+    from a separate, shorter run under tracemalloc.
+    """
+    if inner is None:
+        # Calibrate so one timed group takes roughly 100 microseconds
+        start = time.perf_counter()
+        func()
+        first = time.perf_counter() - start
+        inner = max(1, min(1000, int(1e-4 / first) if first > 0 else 1000))
+    clock = time.perf_counter
+    samples: List[float] = []
+    total_calls = 0
+    spent = 0.0
+    while spent < duration or len(samples) < 5:
+        start = clock()
+        for _ in range(inner):
+            func()
+        elapsed = clock() - start
+        samples.append(elapsed / (inner * ops))
+        total_calls += inner
+        spent += elapsed
+    samples.sort()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(inner):
+            func()
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+    return BenchResult(name, total_calls * ops / spent, _percentile(samples, 0.5) * 1e6,
+                       _percentile(samples, 0.9) * 1e6, _percentile(samples, 0.99) * 1e6,
+                       max(peak, 0) / 1024, len(samples))
+
+
+def run_cases(cases: Iterable[Case], duration: float = 0.2, pattern: Optional[str] = None,
+              report: Optional[Callable[[BenchResult], None]] = None) -> List[BenchResult]:
+    """Measure every case whose name contains pattern."""
+    results = []
+    for name, func, ops in cases:
+        if pattern and pattern not in name:
+            continue
+        result = measure(name, func, ops, duration)
+        if report is not None:
+            report(result)
+        results.append(result)
+    return results
+
+
+def to_baseline(results: Iterable[BenchResult], notes: Optional[Dict[str, str]] = None) -> dict:
+    """JSON document for results, with enough context to judge comparisons."""
+    return {
+        "version": BASELINE_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "notes": notes or {},
+        "results": {r.name: r._asdict() for r in results},
+    }
+
+
+def save_baseline(results: Iterable[BenchResult], path: str, notes: Optional[Dict[str, str]] = None) -> None:
+    with open(path, "w") as f:
+        json.dump(to_baseline(results, notes), f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path: str) -> Dict[str, BenchResult]:
+    """Results of a saved baseline keyed by case name."""
+    with open(path) as f:
+        document = json.load(f)
+    if document.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version: {document.get('version')!r}")
+    return {name: BenchResult(**fields) for name, fields in document["results"].items()}
+
+
+def compare(baseline: Dict[str, BenchResult], current: Iterable[BenchResult],
+            threshold: float = 0.10, memory_floor_kib: float = 4.0) -> List[Regression]:
+    """Cases that are slower, or use more memory, than baseline by more than threshold.
+
+    Throughput is compared as ops/sec and median latency; memory only when
+    the peak grows by more than memory_floor_kib, since tiny peaks are noise.
+    Cases missing from either side are ignored.
+    """
+    regressions = []
+    for result in current:
+        old = baseline.get(result.name)
+        if old is None:
+            continue
+        if result.ops_per_sec < old.ops_per_sec * (1 - threshold):
+            regressions.append(Regression(result.name, "ops_per_sec", old.ops_per_sec, result.ops_per_sec))
+        if result.p50_us > old.p50_us * (1 + threshold):
+            regressions.append(Regression(result.name, "p50_us", old.p50_us, result.p50_us))
+        if result.peak_kib > old.peak_kib * (1 + threshold) + memory_floor_kib:
+            regressions.append(Regression(result.name, "peak_kib", old.peak_kib, result.peak_kib))
+    return regressions
+
+
+def environment_notes() -> Dict[str, str]:
+    """Facts that make two baselines incomparable when they differ."""
+    from .suites import gui_mode
+
+    return {"executable": sys.executable, "gui": gui_mode()}
@@ -0,0 +1,73 @@
+"""
+Command line of the benchmark suite::
+
+    python -m calc.bench run [--suite calculator] [--filter sin] [--output FILE]
+    python -m calc.bench compare BASELINE [CURRENT] [--threshold 0.10]
+
+``compare`` runs the benchmarks itself unless a second result file is given,
+and exits with status 1 if any case regressed past the threshold.
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from . import compare, environment_notes, load_baseline, run_cases, save_baseline
+from .suites import SUITES, all_cases
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m calc.bench', description='Calculator benchmarks.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_run_options(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument('--suite', action='append', choices=sorted(SUITES),
+                         help='suite to run (repeatable; default: all)')
+        sub.add_argument('--filter', metavar='TEXT', help='only cases whose name contains TEXT')
+        sub.add_argument('--duration', type=float, default=0.2,
+                         help='seconds of timing per case (default: 0.2)')
+        sub.add_argument('--quiet', action='store_true', help='do not print each result')
+
+    run = commands.add_parser('run', help='run the benchmarks and optionally save a baseline')
+    add_run_options(run)
+    run.add_argument('--output', metavar='FILE', help='save the results as a JSON baseline')
+
+    cmp = commands.add_parser('compare', help='fail if results regressed against a baseline')
+    cmp.add_argument('baseline', help='baseline JSON file')
+    cmp.add_argument('current', nargs='?', help='results to check (default: run the benchmarks now)')
+    cmp.add_argument('--threshold', type=float, default=0.10,
+                     help='allowed relative slowdown or memory growth (default: 0.10)')
+    cmp.add_argument('--output', metavar='FILE', help='also save the fresh results')
+    add_run_options(cmp)
+    return parser
+
+
+def _run(args: argparse.Namespace):
+    report = None if args.quiet else (lambda result: print(result.format(), flush=True))
+    results = run_cases(all_cases(args.suite), args.duration, args.filter, report)
+    if args.output:
+        save_baseline(results, args.output, environment_notes())
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == 'run':
+        _run(args)
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if args.current:
+        current = list(load_baseline(args.current).values())
+    else:
+        current = _run(args)
+    regressions = compare(baseline, current, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression.format()}", file=sys.stderr)
+    checked = sum(1 for result in current if result.name in baseline)
+    print(f"{checked} cases compared, {len(regressions)} regressions "
+          f"(threshold {args.threshold:.0%})", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
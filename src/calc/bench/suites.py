@@ -0,0 +1,221 @@
+"""
+Benchmark cases for the three levels: Calculator methods, mycalc dispatch
+and GUI event handlers.
+"""
+import io
+import math
+import os
+import sys
+from typing import Any, List, Optional
+
+from ..calculator import Calculator
+from . import Case
+
+# Commands making up the in-memory mycalc scripts; every one succeeds
+SCRIPT_COMMANDS = [
+    "add 5 3", "sub 10 4", "mul 3 4", "div 10 2", "sqrt 9", "sin 1.57", "cos 0",
+    "tan 0.78", "log 100", "ln 2.71", "fact 10", "lfact 1000", "m+", "mr", "m-",
+    "mc", "result", "clear", "plus 1 2", "times 2 3",
+]
+SCRIPT_REPEAT = 10
+
+
+def calculator_cases() -> List[Case]:
+    """One case per Calculator method, plus chained and memoized forms."""
+    calc = Calculator()
+    decimal = Calculator(backend="decimal", precision=50)
+    memoized = Calculator()
+    memoized.enable_memoization()
+    return [
+        ("calculator.add", lambda: calc.add(5, 3), 1),
+        ("calculator.add_chained", lambda: calc.add(1), 1),
+        ("calculator.subtract", lambda: calc.subtract(10, 4), 1),
+        ("calculator.multiply", lambda: calc.multiply(3, 4), 1),
+        ("calculator.divide", lambda: calc.divide(10, 4), 1),
+        ("calculator.power", lambda: calc.power(2, 10), 1),
+        ("calculator.modulo", lambda: calc.modulo(17, 5), 1),
+        ("calculator.square_root", lambda: calc.square_root(2), 1),
+        ("calculator.sin", lambda: calc.sin(0.5), 1),
+        ("calculator.cos", lambda: calc.cos(0.5), 1),
+        ("calculator.tan", lambda: calc.tan(0.5), 1),
+        ("calculator.log10", lambda: calc.log10(100), 1),
+        ("calculator.ln", lambda: calc.ln(2), 1),
+        ("calculator.exp", lambda: calc.exp(1), 1),
+        ("calculator.factorial_20", lambda: calc.factorial(20), 1),
+        ("calculator.factorial_5000", lambda: calc.factorial(5000), 1),
+        ("calculator.log_factorial", lambda: calc.log_factorial(10 ** 6), 1),
+        ("calculator.memory_add", calc.memory_add, 1),
+        ("calculator.memory_recall", calc.memory_recall, 1),
+        ("calculator.clear", calc.clear, 1),
+        ("calculator.sin_memoized", lambda: memoized.sin(0.5), 1),
+        ("calculator.decimal_divide", lambda: decimal.divide(1, 3), 1),
+        ("calculator.decimal_sin", lambda: decimal.sin(1), 1),
+    ]
+
+
+def _script(commands: List[str]) -> str:
+    return "\n".join(commands * SCRIPT_REPEAT) + "\nexit\n"
+
+
+class _NullWriter(io.TextIOBase):
+    """A stdout replacement that discards everything cheaply."""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+def _run_interactive(script: str) -> None:
+    from .. import mycalc
+
+    stdin, stdout = sys.stdin, sys.stdout
+    sys.stdin, sys.stdout = io.StringIO(script), _NullWriter()
+    try:
+        mycalc([])
+    finally:
+        sys.stdin, sys.stdout = stdin, stdout
+
+
+def mycalc_cases() -> List[Case]:
+    """The interactive loop and --batch mode, fed from in-memory scripts."""
+    from ..cli import run_batch
+
+    script = _script(SCRIPT_COMMANDS)
+    commands = len(SCRIPT_COMMANDS) * SCRIPT_REPEAT + 1
+    return [
+        ("mycalc.interactive", lambda: _run_interactive(script), commands),
+        ("mycalc.batch_text", lambda: run_batch(io.StringIO(script), _NullWriter()), commands),
+        ("mycalc.batch_jsonl", lambda: run_batch(io.StringIO(script), _NullWriter(), fmt='jsonl'), commands),
+        ("mycalc.unknown_command", lambda: _run_interactive("sine 1\n" * 20 + "exit\n"), 21),
+    ]
+
+
+class _Var:
+    """Stand-in for tk.StringVar when there is no display."""
+
+    def __init__(self) -> None:
+        self.value = ""
+
+    def set(self, value: str) -> None:
+        self.value = value
+
+    def get(self) -> str:
+        return self.value
+
+
+class _Widget:
+    """Stand-in for a Tk widget that only gets configured."""
+
+    def config(self, **options: Any) -> None:
+        self.options = options
+
+    configure = config
+
+
+class _Event:
+    def __init__(self, char: str, keysym: str = "") -> None:
+        self.char = char
+        self.keysym = keysym or char
+
+
+def gui_mode() -> str:
+    """'tk' when a display is available, else 'headless'."""
+    if sys.platform.startswith(("win", "darwin")) or os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"):
+        return "tk"
+    return "headless"
+
+
+def _make_gui():
+    """A CalculatorGUI on a withdrawn Tk root, or with stand-in widgets when headless."""
+    from ..gui import CalculatorGUI
+
+    if gui_mode() == "tk":
+        import tkinter as tk
+
+        root = tk.Tk()
+        root.withdraw()
+        return CalculatorGUI(root)
+    gui = CalculatorGUI.__new__(CalculatorGUI)
+    gui.calc = Calculator()
+    gui.root = None
+    gui.current_input = ""
+    gui.operation_pending = False
+    gui.display_var = _Var()
+    gui.memory_status = _Widget()
+    return gui
+
+
+def gui_cases() -> List[Case]:
+    """Button and keyboard handlers, without the Tk event loop."""
+    try:
+        gui = _make_gui()
+    except Exception:  # tkinter missing or unusable
+        return []
+
+    def keypad() -> None:
+        gui._all_clear()
+        for key in "12.5":
+            gui._add_digit(key)
+        gui._set_operation("mul")
+        for key in "4":
+            gui._add_digit(key)
+        gui._calculate()
+
+    keys = [_Event("\x1b", "Escape")] + [_Event(c) for c in "7*6"] + [_Event("\r", "Return")]
+
+    def keyboard() -> None:
+        for event in keys:
+            gui._key_press(event)
+
+    def scientific() -> None:
+        gui._add_digit("2")
+        gui._scientific_func(gui.calc.square_root)
+
+    def memory() -> None:
+        gui._add_digit("3")
+        gui._memory_add()
+        gui._memory_recall()
+
+    return [
+        ("gui.keypad_sequence", keypad, 8),
+        ("gui.key_press", keyboard, len(keys)),
+        ("gui.scientific", scientific, 2),
+        ("gui.memory", memory, 3),
+        ("gui.constant", lambda: gui._add_constant(math.pi), 1),
+    ]
+
+
+def metrics_cases() -> List[Case]:
+    """Calculator.add after metrics were enabled and disabled, and while measured.
+
+    The disabled case should match calculator.add: disabling puts the
+    original methods back.
+    """
+    from .. import metrics
+
+    calc = Calculator()
+    if not metrics.enabled():
+        metrics.enable()
+        metrics.disable()
+    instrumented = metrics._wrap(Calculator.add, "bench.calculator.add")
+    return [
+        ("metrics.add_disabled", lambda: calc.add(5, 3), 1),
+        ("metrics.add_enabled", lambda: instrumented(calc, 5, 3), 1),
+    ]
+
+
+SUITES = {
+    "calculator": calculator_cases,
+    "mycalc": mycalc_cases,
+    "gui": gui_cases,
+    "metrics": metrics_cases,
+}
+
+
+def all_cases(names: Optional[List[str]] = None) -> List[Case]:
+    """Cases of the named suites (all suites by default)."""
+    cases: List[Case] = []
+    for name in names or SUITES:
+        if name not in SUITES:
+            raise ValueError(f"Unknown suite: {name!r} (expected one of {sorted(SUITES)})")
+        cases.extend(SUITES[name]())
+    return cases
@@ -1,185 +1,249 @@
 import math
-from typing import Optional
+from typing import Any, Callable, Optional, Union
+
+from . import kernel, metrics
+from .backends import get_backend
+from .batch import BatchCalculator
+from .memo import MISSING, CacheStats, make_cache
+from .session import CalculatorSession
+
+
+def _memo_key(name: str, args: tuple) -> tuple:
+    # 2 and 2.0, or 0.0 and -0.0, compare equal but may give different
+    # results, so the argument types and signed zeros are part of the key.
+    return (name,) + tuple(x if x else repr(x) for x in args) + tuple(type(x) for x in args)
+
 
 class Calculator:
     """
     A comprehensive calculator class with basic and advanced mathematical operations.
+
+    The numeric backend is chosen per instance: ``Calculator()`` uses floats,
+    ``Calculator(backend="decimal", precision=50)`` uses 50-digit decimals.
+
+    The math is done by the stateless ``calc.kernel``; the last result and
+    memory live in a ``CalculatorSession``, which can be passed in to wrap
+    existing state.
     """
+
+    __slots__ = ("_session", "_backend", "_memo")
+
+    # Vectorized, stateless versions of the operations: Calculator.batch.divide(a, b)
+    batch = BatchCalculator()
     
-    def __init__(self) -> None:
+    def __init__(self, backend: Union[str, Any] = "float", precision: Optional[int] = None,
+                 session: Optional[CalculatorSession] = None) -> None:
         """Initialize the calculator with an empty memory."""
-        self.memory: float = 0
-        self.last_result: float = 0
+        self._session = CalculatorSession() if session is None else session
+        self._backend = get_backend(backend, precision)
+        self._memo = None
+    
+    @property
+    def session(self) -> CalculatorSession:
+        """The state (last result and memory) this calculator operates on."""
+        return self._session
+    
+    @property
+    def backend(self):
+        """The numeric backend doing the arithmetic."""
+        return self._backend
+    
+    @property
+    def last_result(self) -> Any:
+        return self._session.last_result
+    
+    @last_result.setter
+    def last_result(self, value: Any) -> None:
+        self._session.last_result = value
+    
+    @property
+    def memory(self) -> Any:
+        return self._session.memory
+    
+    @memory.setter
+    def memory(self, value: Any) -> None:
+        self._session.memory = value
+    
+    # Memoization of the scientific functions
+    def enable_memoization(self, maxsize: int = 1024, policy: str = "lru") -> None:
+        """Cache results of factorial, ln, log10, sin, cos, tan and power.
+
+        policy is "lru" or "lfu".  Results, errors and last_result updates are
+        identical with and without the cache.
+        """
+        self._memo = make_cache(policy, maxsize)
+    
+    def disable_memoization(self) -> None:
+        """Drop the cache and go back to computing every call."""
+        self._memo = None
+    
+    def memo_stats(self) -> Optional[CacheStats]:
+        """Hit, miss and eviction counts, or None if memoization is off."""
+        return None if self._memo is None else self._memo.stats()
+    
+    def _memoized(self, name: str, func: Callable, *args: Any) -> Any:
+        key = _memo_key(name, args)
+        result = self._memo.get(key)
+        if result is MISSING:
+            result = func(*args, self._backend)
+            self._memo.put(key, result)
+        return result
     
     def add(self, a: float, b: Optional[float] = None) -> float:
         """Add two numbers or add a number to the last result."""
+        session = self._session
         if b is None:
-            result = self.last_result + a
-        else:
-            result = a + b
-        self.last_result = result
+            a, b = session.last_result, a
+        result = session.last_result = kernel.add(a, b, self._backend)
         return result
     
     def subtract(self, a: float, b: Optional[float] = None) -> float:
         """Subtract b from a or subtract a from the last result."""
+        session = self._session
         if b is None:
-            result = self.last_result - a
-        else:
-            result = a - b
-        self.last_result = result
+            a, b = session.last_result, a
+        result = session.last_result = kernel.subtract(a, b, self._backend)
         return result
     
     def multiply(self, a: float, b: Optional[float] = None) -> float:
         """Multiply two numbers or multiply the last result by a."""
+        session = self._session
         if b is None:
-            result = self.last_result * a
-        else:
-            result = a * b
-        self.last_result = result
+            a, b = session.last_result, a
+        result = session.last_result = kernel.multiply(a, b, self._backend)
         return result
     
     def divide(self, a: float, b: Optional[float] = None) -> float:
         """Divide a by b or divide the last result by a."""
+        session = self._session
         if b is None:
-            if a == 0:
-                raise ZeroDivisionError("Cannot divide by zero")
-            result = self.last_result / a
-        else:
-            if b == 0:
-                raise ZeroDivisionError("Cannot divide by zero")
-            result = a / b
-        self.last_result = result
+            a, b = session.last_result, a
+        result = session.last_result = kernel.divide(a, b, self._backend)
         return result
     
     def power(self, a: float, b: Optional[float] = None) -> float:
         """Calculate a raised to power b, or last result raised to power a."""
+        session = self._session
         if b is None:
-            result = self.last_result ** a
+            a, b = session.last_result, a
+        if self._memo is None:
+            result = kernel.power(a, b, self._backend)
         else:
-            result = a ** b
-        self.last_result = result
+            result = self._memoized("power", kernel.power, a, b)
+        session.last_result = result
         return result
     
     def square_root(self, a: Optional[float] = None) -> float:
         """Calculate the square root of a number or the last result."""
+        session = self._session
         if a is None:
-            if self.last_result < 0:
-                raise ValueError("Cannot calculate square root of negative number")
-            result = math.sqrt(self.last_result)
-        else:
-            if a < 0:
-                raise ValueError("Cannot calculate square root of negative number")
-            result = math.sqrt(a)
-        self.last_result = result
+            a = session.last_result
+        result = session.last_result = kernel.square_root(a, self._backend)
         return result
     
     def modulo(self, a: float, b: Optional[float] = None) -> float:
         """Calculate remainder when a is divided by b, or last result divided by a."""
+        session = self._session
         if b is None:
-            if a == 0:
-                raise ZeroDivisionError("Cannot divide by zero")
-            result = self.last_result % a
-        else:
-            if b == 0:
-                raise ZeroDivisionError("Cannot divide by zero")
-            result = a % b
-        self.last_result = result
+            a, b = session.last_result, a
+        result = session.last_result = kernel.modulo(a, b, self._backend)
         return result
     
     # Memory operations
     def memory_store(self) -> float:
         """Store the last result in memory."""
-        self.memory = self.last_result
-        return self.memory
+        return self._session.memory_store()
     
     def memory_recall(self) -> float:
         """Recall the value stored in memory."""
-        self.last_result = self.memory
-        return self.memory
+        return self._session.memory_recall()
     
     def memory_clear(self) -> float:
         """Clear the memory."""
-        self.memory = 0
-        return self.memory
+        return self._session.memory_clear()
     
     def memory_add(self) -> float:
         """Add last result to memory."""
-        self.memory += self.last_result
-        return self.memory
+        return self._session.memory_add(self._backend)
     
     def memory_subtract(self) -> float:
         """Subtract last result from memory."""
-        self.memory -= self.last_result
-        return self.memory
+        return self._session.memory_subtract(self._backend)
     
     # Scientific functions
     def sin(self, angle: Optional[float] = None) -> float:
         """Calculate sine of an angle in radians."""
-        if angle is None:
-            result = math.sin(self.last_result)
-        else:
-            result = math.sin(angle)
-        self.last_result = result
-        return result
+        return self._unary("sin", kernel.sin, angle)
     
     def cos(self, angle: Optional[float] = None) -> float:
         """Calculate cosine of an angle in radians."""
-        if angle is None:
-            result = math.cos(self.last_result)
-        else:
-            result = math.cos(angle)
-        self.last_result = result
-        return result
+        return self._unary("cos", kernel.cos, angle)
     
     def tan(self, angle: Optional[float] = None) -> float:
         """Calculate tangent of an angle in radians."""
-        if angle is None:
-            result = math.tan(self.last_result)
-        else:
-            result = math.tan(angle)
-        self.last_result = result
-        return result
+        return self._unary("tan", kernel.tan, angle)
     
     def log10(self, a: Optional[float] = None) -> float:
         """Calculate base-10 logarithm of a number."""
-        if a is None:
-            if self.last_result <= 0:
-                raise ValueError("Cannot calculate logarithm of non-positive number")
-            result = math.log10(self.last_result)
-        else:
-            if a <= 0:
-                raise ValueError("Cannot calculate logarithm of non-positive number")
-            result = math.log10(a)
-        self.last_result = result
-        return result
+        return self._unary("log10", kernel.log10, a)
     
     def ln(self, a: Optional[float] = None) -> float:
         """Calculate natural logarithm of a number."""
+        return self._unary("ln", kernel.ln, a)
+    
+    def exp(self, a: Optional[float] = None) -> float:
+        """Calculate e raised to a, or to the last result."""
+        session = self._session
         if a is None:
-            if self.last_result <= 0:
-                raise ValueError("Cannot calculate logarithm of non-positive number")
-            result = math.log(self.last_result)
-        else:
-            if a <= 0:
-                raise ValueError("Cannot calculate logarithm of non-positive number")
-            result = math.log(a)
-        self.last_result = result
+            a = session.last_result
+        result = session.last_result = kernel.exp(a, self._backend)
         return result
     
     def factorial(self, n: Optional[int] = None) -> int:
-        """Calculate factorial of n."""
+        """Calculate factorial of n.
+
+        Returns an exact FactorialResult.  When n! is too large for a float,
+        last_result keeps the exact integer so ln/log10 can still chain on it.
+        """
+        session = self._session
+        if n is None:
+            n = int(session.last_result)
+        if self._memo is None:
+            result = kernel.factorial(n)
+        else:
+            result = self._memoized("factorial", kernel.factorial, n)
+        session.last_result = self._backend.from_int(result)
+        return result
+    
+    def log_factorial(self, n: Optional[int] = None) -> float:
+        """Calculate ln(n!) without computing n! (log-gamma / Stirling)."""
+        session = self._session
         if n is None:
-            n = int(self.last_result)
-        if not isinstance(n, int) or n < 0:
-            raise ValueError("Factorial requires a non-negative integer")
-        result = math.factorial(n)
-        self.last_result = float(result)
+            n = int(session.last_result)
+        result = session.last_result = kernel.log_factorial(n, self._backend)
         return result
     
     def clear(self) -> float:
         """Clear the last result."""
-        self.last_result = 0
-        return self.last_result
+        return self._session.clear()
+    
+    def _unary(self, name: str, func: Callable, a: Any) -> Any:
+        session = self._session
+        if a is None:
+            a = session.last_result
+        if self._memo is None:
+            result = func(a, self._backend)
+        else:
+            result = self._memoized(name, func, a)
+        session.last_result = result
+        return result
+
+
+metrics.register(Calculator, [
+    "add", "subtract", "multiply", "divide", "power", "square_root", "modulo",
+    "memory_store", "memory_recall", "memory_clear", "memory_add", "memory_subtract",
+    "sin", "cos", "tan", "log10", "ln", "exp", "factorial", "log_factorial", "clear",
+], "calculator.{}")
 
 
 # Example usage
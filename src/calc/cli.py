@@ -0,0 +1,291 @@
+"""
+Command tables and the non-interactive batch mode of ``mycalc``.
+
+``mycalc --batch FILE`` (or ``-`` for stdin) streams commands through a
+generator pipeline -- read, parse, execute, format -- and writes one result
+per line (or one JSON object per line) through a buffered writer.  No prompts
+or help text are printed; a throughput summary goes to stderr at the end.
+"""
+import argparse
+import json
+import sys
+import time
+from typing import IO, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from . import metrics
+from .calculator import Calculator
+
+# Command aliases dictionary
+ALIASES = {
+    'add': ['add', 'addition', 'plus', 'sum', '+'],
+    'sub': ['sub', 'subtract', 'subtraction', 'substract', 'minus', 'difference', '-'],
+    'mul': ['mul', 'multiply', 'multiplication', 'product', '*', 'times'],
+    'div': ['div', 'divide', 'division', 'quotient', '/'],
+    'sqrt': ['sqrt', 'squareroot', 'square_root', 'root'],
+    'sin': ['sin', 'sine'],
+    'cos': ['cos', 'cosine'],
+    'tan': ['tan', 'tangent'],
+    'log': ['log', 'log10', 'logarithm'],
+    'ln': ['ln', 'natural_log', 'loge'],
+    'fact': ['fact', 'factorial', '!'],
+    'lfact': ['lfact', 'lnfact', 'log_factorial', 'lgamma'],
+    'result': ['result', 'ans', 'answer'],
+    'clear': ['clear', 'clr', 'reset'],
+    'm+': ['m+', 'memory_add', 'memory+'],
+    'm-': ['m-', 'memory_subtract', 'memory-'],
+    'mr': ['mr', 'memory_recall', 'recall'],
+    'mc': ['mc', 'memory_clear', 'clearmem'],
+    'exit': ['exit', 'quit', 'bye', 'q'],
+    'help': ['help', 'h', '?', 'commands']
+}
+
+# Flattened alias -> main command lookup, built once at import
+COMMAND_MAP = {alias: main_cmd for main_cmd, alias_list in ALIASES.items() for alias in alias_list}
+
+# Main command -> Calculator method for operations taking numbers
+BINARY_COMMANDS = {'add': 'add', 'sub': 'subtract', 'mul': 'multiply', 'div': 'divide'}
+UNARY_COMMANDS = {
+    'sqrt': 'square_root', 'sin': 'sin', 'cos': 'cos', 'tan': 'tan',
+    'log': 'log10', 'ln': 'ln', 'fact': 'factorial', 'lfact': 'log_factorial',
+}
+
+ERROR_POLICIES = ('emit', 'skip', 'stop')
+FORMATS = ('text', 'jsonl')
+
+# Number of output records collected before each write to the output stream
+_WRITE_CHUNK = 4096
+
+
+class BatchRecord(NamedTuple):
+    """Outcome of one command line in batch mode."""
+    line: int
+    command: str
+    result: object = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+
+
+class BatchSummary(NamedTuple):
+    """Totals reported at the end of a batch run."""
+    commands: int
+    ok: int
+    errors: int
+    elapsed: float
+    stopped: bool
+
+    @property
+    def rate(self) -> float:
+        """Commands processed per second."""
+        return self.commands / self.elapsed if self.elapsed > 0 else float('inf')
+
+    def format(self) -> str:
+        status = " (stopped on error)" if self.stopped else ""
+        return (f"{self.commands} commands, {self.ok} ok, {self.errors} errors "
+                f"in {self.elapsed:.3f}s ({self.rate:,.0f} commands/s){status}")
+
+
+def parse_lines(lines: Iterable[str], first_line: int = 1) -> Iterator[Tuple[int, List[str]]]:
+    """Yield (line number, words) for every non-blank, non-comment line."""
+    for number, line in enumerate(lines, first_line):
+        parts = line.strip().lower().split()
+        if parts and not parts[0].startswith('#'):
+            yield number, parts
+
+
+def execute(calc: Calculator, parts: List[str]):
+    """Run one command against calc and return its result.
+
+    Unlike the interactive demo, operands may be omitted to chain on the last
+    result (``add 5`` adds 5 to it, ``sqrt`` takes its square root).  Returns
+    None for commands that produce no value (``help``).
+    """
+    cmd = parts[0]
+    main_cmd = COMMAND_MAP.get(cmd)
+    if main_cmd is None:
+        raise LookupError(f"Unknown command: '{cmd}'")
+    args = [float(p) for p in parts[1:]]
+
+    if main_cmd in BINARY_COMMANDS:
+        if not args:
+            raise ValueError(f"{main_cmd} requires at least one number")
+        return getattr(calc, BINARY_COMMANDS[main_cmd])(*args[:2])
+    if main_cmd in UNARY_COMMANDS:
+        if main_cmd in ('fact', 'lfact') and args:
+            args[0] = int(args[0])
+        return getattr(calc, UNARY_COMMANDS[main_cmd])(*args[:1])
+    if main_cmd == 'result':
+        return calc.last_result
+    if main_cmd == 'clear':
+        return calc.clear()
+    if main_cmd == 'm+':
+        return calc.memory_add()
+    if main_cmd == 'm-':
+        return calc.memory_subtract()
+    if main_cmd == 'mr':
+        return calc.memory_recall()
+    if main_cmd == 'mc':
+        return calc.memory_clear()
+    return None
+
+
+def _execute_metric(calc: Calculator, parts: List[str]) -> str:
+    return "mycalc." + COMMAND_MAP.get(parts[0], "unknown")
+
+
+metrics.register(sys.modules[__name__], ["execute"], _execute_metric)
+
+
+def run_commands(lines: Iterable[str], calc: Optional[Calculator] = None,
+                 first_line: int = 1) -> Iterator[BatchRecord]:
+    """Execute command lines lazily, yielding one record per command.
+
+    Stops at an ``exit`` command.  Errors are yielded as records rather than
+    raised, so the caller decides the error policy.
+    """
+    if calc is None:
+        calc = Calculator()
+    for number, parts in parse_lines(lines, first_line):
+        cmd = parts[0]
+        if COMMAND_MAP.get(cmd) == 'exit':
+            return
+        try:
+            result = execute(calc, parts)
+        except (ArithmeticError, ValueError, LookupError) as e:
+            yield BatchRecord(number, cmd, error=str(e), error_type=type(e).__name__)
+            continue
+        if result is not None:
+            yield BatchRecord(number, cmd, result)
+
+
+def run_expressions(lines: Iterable[str], first_line: int = 1) -> Iterator[BatchRecord]:
+    """Evaluate one independent expression per line (``--expr`` mode)."""
+    from .expr import evaluate
+
+    for number, line in enumerate(lines, first_line):
+        text = line.strip()
+        if not text or text.startswith('#'):
+            continue
+        try:
+            result = evaluate(text)
+        except (ArithmeticError, ValueError, LookupError) as e:
+            yield BatchRecord(number, text, error=str(e), error_type=type(e).__name__)
+            continue
+        yield BatchRecord(number, text, result)
+
+
+def _format_text(record: BatchRecord) -> str:
+    if record.error is not None:
+        return f"error line {record.line}: {record.error}\n"
+    return f"{record.result}\n"
+
+
+def _format_jsonl(record: BatchRecord) -> str:
+    if record.error is not None:
+        return json.dumps({"line": record.line, "command": record.command,
+                           "error": record.error, "type": record.error_type}) + "\n"
+    result = record.result
+    if isinstance(result, int) and result.bit_length() > 53:
+        result = str(result)  # keep big integers exact
+    return json.dumps({"line": record.line, "command": record.command, "result": result}) + "\n"
+
+
+def run_batch(lines: Iterable[str], out: IO[str], fmt: str = 'text',
+              on_error: str = 'emit', calc: Optional[Calculator] = None) -> BatchSummary:
+    """Stream command lines through the calculator and write results to out."""
+    return write_records(run_commands(lines, calc), out, fmt, on_error)
+
+
+def write_records(records: Iterable[BatchRecord], out: IO[str], fmt: str = 'text',
+                  on_error: str = 'emit') -> BatchSummary:
+    """Format records to out under an error policy and summarize the run."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt!r}")
+    if on_error not in ERROR_POLICIES:
+        raise ValueError(f"Unknown error policy: {on_error!r}")
+    formatter = _format_jsonl if fmt == 'jsonl' else _format_text
+
+    start = time.perf_counter()
+    commands = errors = 0
+    stopped = False
+    pending: List[str] = []
+    for record in records:
+        commands += 1
+        if record.error is None:
+            try:
+                line = formatter(record)
+            except ValueError as e:  # result too large to render
+                record = record._replace(result=None, error=str(e), error_type=type(e).__name__)
+        if record.error is not None:
+            errors += 1
+            if on_error == 'skip':
+                continue
+            line = formatter(record)
+            if on_error == 'stop':
+                pending.append(line)
+                stopped = True
+                break
+        pending.append(line)
+        if len(pending) >= _WRITE_CHUNK:
+            out.writelines(pending)
+            pending.clear()
+    out.writelines(pending)
+    out.flush()
+    elapsed = time.perf_counter() - start
+    return BatchSummary(commands, commands - errors, errors, elapsed, stopped)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options of ``mycalc``."""
+    parser = argparse.ArgumentParser(prog='mycalc', description='Interactive calculator demo.')
+    parser.add_argument('--batch', metavar='FILE',
+                        help="run commands from FILE ('-' for stdin) without prompts")
+    parser.add_argument('--format', choices=FORMATS, default='text',
+                        help='batch output format (default: text, one result per line)')
+    parser.add_argument('--on-error', choices=ERROR_POLICIES, default='emit',
+                        help='batch error policy (default: emit an error record)')
+    parser.add_argument('--output', metavar='FILE', help='write batch results to FILE')
+    parser.add_argument('--quiet', action='store_true', help='do not print the batch summary')
+    parser.add_argument('--expr', action='store_true',
+                        help='batch lines are independent expressions instead of commands')
+    parser.add_argument('--jobs', type=int, metavar='N',
+                        help='evaluate the batch on N processes (0: one per CPU)')
+    parser.add_argument('--metrics', metavar='FILE',
+                        help='record operation metrics and dump them to FILE (.json or Prometheus text)')
+    parser.add_argument('--metrics-interval', type=float, default=10.0, metavar='SECONDS',
+                        help='seconds between metrics dumps (default: 10)')
+    return parser
+
+
+def batch_main(args: argparse.Namespace) -> int:
+    """Run ``mycalc --batch`` with parsed options and return the exit status."""
+    if args.jobs is not None:
+        return _parallel_main(args)
+    source = sys.stdin if args.batch == '-' else open(args.batch, buffering=1 << 20)
+    out = sys.stdout if args.output is None else open(args.output, 'w', buffering=1 << 20)
+    try:
+        if args.expr:
+            summary = write_records(run_expressions(source), out, args.format, args.on_error)
+        else:
+            summary = run_batch(source, out, args.format, args.on_error)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    if not args.quiet:
+        print(summary.format(), file=sys.stderr)
+    return 1 if summary.stopped else 0
+
+
+def _parallel_main(args: argparse.Namespace) -> int:
+    from .parallel import run_file
+
+    out = sys.stdout if args.output is None else open(args.output, 'w', buffering=1 << 20)
+    try:
+        summary = run_file(args.batch, out, args.jobs or None, args.format, args.on_error, args.expr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if not args.quiet:
+        print(summary.format(), file=sys.stderr)
+    return 1 if summary.stopped else 0
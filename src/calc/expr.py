@@ -0,0 +1,360 @@
+"""
+Expression language for the calculator.
+
+Expressions such as ``3*(x+2)^2/sin(y)`` are parsed with the usual operator
+precedence, constant-folded and compiled once into a plain Python function.
+Compiled expressions are kept in a bounded LRU cache keyed by the expression
+text, so evaluating the same formula repeatedly with different variable
+bindings only pays for parsing the first time.
+
+Example::
+
+    from calc import expr
+
+    f = expr.compile_expression("3*(x+2)^2/sin(y)")
+    f(x=1, y=0.5)                      # fast path, no parsing
+    expr.evaluate("sqrt(x) + 1", x=9)  # 4.0, compiled form is cached
+"""
+import keyword
+import math
+import re
+import threading
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from . import kernel
+from .memo import MISSING, CacheStats, LRUCache
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression cannot be parsed or compiled."""
+
+
+# Compiled code calls the stateless kernel, so errors match Calculator.
+def _factorial(n: float) -> int:
+    if n < 0 or n != int(n):
+        raise ValueError("Factorial requires a non-negative integer")
+    return kernel.factorial(int(n))
+
+
+# Function name -> (helper name in generated code, implementation)
+FUNCTIONS: Dict[str, Tuple[str, Callable]] = {
+    "sin": ("_f_sin", math.sin),
+    "cos": ("_f_cos", math.cos),
+    "tan": ("_f_tan", math.tan),
+    "sqrt": ("_f_sqrt", kernel.square_root),
+    "log": ("_f_log10", kernel.log10),
+    "log10": ("_f_log10", kernel.log10),
+    "ln": ("_f_ln", kernel.ln),
+    "fact": ("_f_fact", _factorial),
+    "factorial": ("_f_fact", _factorial),
+}
+
+CONSTANTS: Dict[str, float] = {
+    "pi": math.pi,
+    "e": math.e,
+}
+
+# Binary operator -> (helper name or None for an inline Python operator, implementation)
+_BINARY: Dict[str, Tuple[Optional[str], Callable]] = {
+    "+": (None, lambda a, b: a + b),
+    "-": (None, lambda a, b: a - b),
+    "*": (None, lambda a, b: a * b),
+    "/": ("_f_div", kernel.divide),
+    "%": ("_f_mod", kernel.modulo),
+    "^": (None, lambda a, b: a ** b),
+}
+
+_NAMESPACE: Dict[str, Any] = {"__builtins__": {}}
+for _helper, _func in list(FUNCTIONS.values()) + [v for v in _BINARY.values() if v[0]]:
+    _NAMESPACE[_helper] = _func
+
+
+# Tokenizer
+
+_TOKEN_RE = re.compile(r"""
+      (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<op>[-+*/%^!()])
+    """, re.VERBOSE)
+
+
+def _tokenize(text: str) -> List[Tuple[str, Any, int]]:
+    tokens = []
+    pos = 0
+    end = len(text.rstrip())
+    while pos < end:
+        if text[pos].isspace():
+            pos += 1
+            continue
+        match = _TOKEN_RE.match(text, pos)
+        if match is None:
+            raise ExpressionError(f"Unexpected character {text[pos]!r} at position {pos}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "number":
+            value = float(value)
+        tokens.append((kind, value, pos))
+        pos = match.end()
+    tokens.append(("end", None, end))
+    return tokens
+
+
+# Parser (recursive descent).  Nodes are tuples:
+#   ("num", value) ("var", name) ("neg", node) ("bin", op, left, right)
+#   ("call", name, node) ("fact", node)
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self.tokens = _tokenize(text)
+        self.index = 0
+
+    def peek(self) -> Tuple[str, Any, int]:
+        return self.tokens[self.index]
+
+    def advance(self) -> Tuple[str, Any, int]:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def expect(self, value: str) -> None:
+        kind, got, pos = self.advance()
+        if got != value:
+            found = "end of expression" if kind == "end" else repr(got)
+            raise ExpressionError(f"Expected {value!r} at position {pos}, found {found}")
+
+    def parse(self) -> tuple:
+        node = self.additive()
+        kind, value, pos = self.peek()
+        if kind != "end":
+            raise ExpressionError(f"Unexpected {value!r} at position {pos}")
+        return node
+
+    def additive(self) -> tuple:
+        node = self.multiplicative()
+        while self.peek()[1] in ("+", "-"):
+            op = self.advance()[1]
+            node = ("bin", op, node, self.multiplicative())
+        return node
+
+    def multiplicative(self) -> tuple:
+        node = self.unary()
+        while self.peek()[1] in ("*", "/", "%"):
+            op = self.advance()[1]
+            node = ("bin", op, node, self.unary())
+        return node
+
+    def unary(self) -> tuple:
+        op = self.peek()[1]
+        if op == "-":
+            self.advance()
+            return ("neg", self.unary())
+        if op == "+":
+            self.advance()
+            return self.unary()
+        return self.power()
+
+    def power(self) -> tuple:
+        node = self.postfix()
+        if self.peek()[1] == "^":
+            self.advance()
+            # Right associative, and binds tighter than unary minus on the left
+            node = ("bin", "^", node, self.unary())
+        return node
+
+    def postfix(self) -> tuple:
+        node = self.primary()
+        while self.peek()[1] == "!":
+            self.advance()
+            node = ("fact", node)
+        return node
+
+    def primary(self) -> tuple:
+        kind, value, pos = self.advance()
+        if kind == "number":
+            return ("num", value)
+        if kind == "name":
+            if self.peek()[1] == "(":
+                if value not in FUNCTIONS:
+                    raise ExpressionError(f"Unknown function {value!r} at position {pos}")
+                self.advance()
+                arg = self.additive()
+                self.expect(")")
+                return ("call", value, arg)
+            if value in CONSTANTS:
+                return ("num", CONSTANTS[value])
+            if value.startswith("_") or keyword.iskeyword(value):
+                raise ExpressionError(f"Invalid variable name {value!r} at position {pos}")
+            return ("var", value)
+        if value == "(":
+            node = self.additive()
+            self.expect(")")
+            return node
+        found = "end of expression" if kind == "end" else repr(value)
+        raise ExpressionError(f"Unexpected {found} at position {pos}")
+
+
+def parse(text: str) -> tuple:
+    """Parse an expression into a tuple-based syntax tree."""
+    return _Parser(text).parse()
+
+
+def fold_constants(node: tuple) -> tuple:
+    """Evaluate every sub-tree that does not depend on a variable.
+
+    Sub-trees whose evaluation raises (``1/0``) are left as they are, so the
+    error surfaces when the expression is evaluated.
+    """
+    kind = node[0]
+    if kind in ("num", "var"):
+        return node
+    if kind == "bin":
+        op, left, right = node[1], fold_constants(node[2]), fold_constants(node[3])
+        node = ("bin", op, left, right)
+        if left[0] == "num" and right[0] == "num":
+            return _try_fold(node, _BINARY[op][1], left[1], right[1])
+        return node
+    child = fold_constants(node[-1])
+    node = node[:-1] + (child,)
+    if child[0] == "num":
+        if kind == "neg":
+            return ("num", -child[1])
+        func = FUNCTIONS[node[1]][1] if kind == "call" else _factorial
+        return _try_fold(node, func, child[1])
+    return node
+
+
+def _try_fold(node: tuple, func: Callable, *args: float) -> tuple:
+    try:
+        value = func(*args)
+    except (ArithmeticError, ValueError):
+        return node
+    if isinstance(value, complex):
+        return node
+    return ("num", value)
+
+
+def _generate(node: tuple, constants: List[Any]) -> str:
+    kind = node[0]
+    if kind == "num":
+        value = node[1]
+        if isinstance(value, float) and math.isfinite(value):
+            return repr(value)
+        # inf/nan and huge folded integers have no compact literal form
+        constants.append(value)
+        return f"_k{len(constants) - 1}"
+    if kind == "var":
+        return node[1]
+    if kind == "neg":
+        return f"(-{_generate(node[1], constants)})"
+    if kind == "bin":
+        op = node[1]
+        left, right = _generate(node[2], constants), _generate(node[3], constants)
+        helper = _BINARY[op][0]
+        if helper:
+            return f"{helper}({left}, {right})"
+        return f"({left} {'**' if op == '^' else op} {right})"
+    if kind == "call":
+        return f"{FUNCTIONS[node[1]][0]}({_generate(node[2], constants)})"
+    return f"_f_fact({_generate(node[1], constants)})"
+
+
+def _variables(node: tuple, found: Optional[List[str]] = None) -> List[str]:
+    if found is None:
+        found = []
+    if node[0] == "var":
+        if node[1] not in found:
+            found.append(node[1])
+    elif node[0] != "num":
+        for child in node[1:]:
+            if isinstance(child, tuple):
+                _variables(child, found)
+    return found
+
+
+class CompiledExpression(NamedTuple):
+    """A parsed, folded and compiled expression.
+
+    Call it with the variables as keyword (or positional, in order of first
+    appearance) arguments.
+    """
+    text: str
+    variables: Tuple[str, ...]
+    source: str
+    function: Callable
+
+    def __call__(self, *args: float, **variables: float) -> float:
+        try:
+            return self.function(*args, **variables)
+        except TypeError as e:
+            raise ExpressionError(f"Bad variable bindings for {self.text!r}: {e}") from None
+
+
+def _compile(text: str) -> CompiledExpression:
+    tree = fold_constants(parse(text))
+    names = tuple(_variables(tree))
+    constants: List[Any] = []
+    source = f"lambda {', '.join(names)}: {_generate(tree, constants)}"
+    namespace = dict(_NAMESPACE)
+    namespace.update((f"_k{i}", value) for i, value in enumerate(constants))
+    function = eval(compile(source, f"<expr {text!r}>", "eval"), namespace)
+    return CompiledExpression(text, names, source, function)
+
+
+class ExpressionCache:
+    """Bounded, thread-safe LRU cache of compiled expressions keyed by text."""
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self._entries = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    def get(self, text: str) -> CompiledExpression:
+        """Return the compiled form of text, compiling it on a miss."""
+        with self._lock:
+            compiled = self._entries.get(text)
+        if compiled is MISSING:
+            compiled = _compile(text)
+            with self._lock:
+                self._entries.put(text, compiled)
+        return compiled
+
+    def resize(self, maxsize: int) -> None:
+        """Change the capacity, evicting least recently used entries if needed."""
+        with self._lock:
+            self._entries.resize(maxsize)
+
+    def clear(self) -> None:
+        """Drop all cached expressions and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> CacheStats:
+        """Return hit/miss/eviction counters and current size."""
+        return self._entries.stats()
+
+
+_cache = ExpressionCache()
+
+
+def compile_expression(text: str) -> CompiledExpression:
+    """Compile text (or fetch it from the cache) into a callable."""
+    return _cache.get(text)
+
+
+def evaluate(text: str, **variables: float) -> float:
+    """Evaluate text with the given variable bindings."""
+    return _cache.get(text)(**variables)
+
+
+def cache_info() -> CacheStats:
+    """Statistics for the shared compiled-expression cache."""
+    return _cache.info()
+
+
+def set_cache_size(maxsize: int) -> None:
+    """Change the capacity of the shared cache, evicting if needed."""
+    _cache.resize(maxsize)
+
+
+def clear_cache() -> None:
+    """Empty the shared cache."""
+    _cache.clear()
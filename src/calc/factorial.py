@@ -0,0 +1,208 @@
+"""
+Factorials of large n.
+
+``factorial(n)`` returns a ``FactorialResult``: an ``int`` that only turns
+itself into a float, a logarithm or a decimal string when asked to, so a
+million-digit result never goes through ``float()`` or a full ``str()`` by
+accident.  The integer itself is computed by GMP when ``gmpy2`` is installed,
+otherwise by CPython's divide-and-conquer ``math.factorial`` or, with
+``workers=N``, by splitting the product 1*2*...*n into ranges computed in a
+process pool and combined with a balanced product tree.
+
+``log_factorial(n)`` gives ln(n!) directly (log-gamma for floats, the Stirling
+series for decimals) without ever forming n!.
+"""
+import decimal
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from functools import lru_cache
+from typing import List, Optional
+
+try:
+    import gmpy2
+except ImportError:  # gmpy2 is optional; fall back to math.factorial
+    gmpy2 = None
+
+# Below this n a process pool costs more than it saves
+PARALLEL_THRESHOLD = 20000
+
+# Significant digits shown when a result is too long to print in full
+DISPLAY_DIGITS = 15
+
+
+def _max_str_digits() -> int:
+    limit = getattr(sys, "get_int_max_str_digits", lambda: 0)()
+    return limit or 1 << 62
+
+
+def leading_digits(x: int, sig: int = DISPLAY_DIGITS) -> str:
+    """Format a (possibly huge) int in scientific notation with sig digits.
+
+    Only the top bits of x are used, so this costs the same for a 10-digit
+    and a 10-million-digit number.
+    """
+    negative = x < 0
+    x = abs(x)
+    shift = max(x.bit_length() - (4 * sig + 64), 0)
+    ctx = decimal.Context(prec=sig + 10, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+    value = ctx.multiply(ctx.create_decimal(x >> shift), ctx.power(2, shift))
+    text = f"{value:.{sig - 1}e}"
+    return "-" + text if negative else text
+
+
+class FactorialResult(int):
+    """An exact factorial whose conversions are lazy.
+
+    It is an ``int`` in every respect except ``str()``, which falls back to
+    scientific notation when the exact digits would exceed Python's
+    int-to-str limit.  Use ``to_decimal_string()`` for the exact digits.
+    """
+
+    __slots__ = ()
+
+    def log(self) -> float:
+        """Natural logarithm, computed without converting to float."""
+        return math.log(self)
+
+    def log10(self) -> float:
+        """Base-10 logarithm, computed without converting to float."""
+        return math.log10(self)
+
+    @property
+    def digits(self) -> int:
+        """Number of decimal digits."""
+        if self.bit_length() < 1000:
+            return len(int.__repr__(abs(self)))
+        return int(math.log10(self)) + 1
+
+    def to_float(self) -> float:
+        """The value as a float, or inf if it does not fit."""
+        try:
+            return float(self)
+        except OverflowError:
+            return math.inf
+
+    def to_decimal_string(self) -> str:
+        """Exact decimal digits, regardless of the int-to-str limit."""
+        if self.digits <= _max_str_digits():
+            return int.__repr__(self)
+        # CPython >= 3.12 switches to a subquadratic conversion above the limit
+        old = sys.get_int_max_str_digits()
+        sys.set_int_max_str_digits(0)
+        try:
+            return int.__repr__(self)
+        finally:
+            sys.set_int_max_str_digits(old)
+
+    def scientific(self, sig: int = DISPLAY_DIGITS) -> str:
+        """Scientific notation with sig significant digits."""
+        return leading_digits(self, sig)
+
+    def __str__(self) -> str:
+        if self.bit_length() < 3.3 * _max_str_digits():
+            return int.__repr__(self)
+        return leading_digits(self)
+
+    __repr__ = __str__
+
+
+def _range_product(lo: int, hi: int) -> int:
+    """Product lo * (lo+1) * ... * hi by binary splitting."""
+    if hi - lo < 16:
+        result = 1
+        for k in range(lo, hi + 1):
+            result *= k
+        return result
+    mid = (lo + hi) // 2
+    return _range_product(lo, mid) * _range_product(mid + 1, hi)
+
+
+def _product_tree(values: List[int]) -> int:
+    """Multiply values pairwise so the operands stay balanced in size."""
+    while len(values) > 1:
+        paired = [values[i] * values[i + 1] for i in range(0, len(values) - 1, 2)]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return values[0] if values else 1
+
+
+def _parallel_factorial(n: int, workers: int) -> int:
+    chunks = workers * 4
+    bounds = [1 + (n * i) // chunks for i in range(chunks + 1)]
+    los = bounds[:-1]
+    his = [b - 1 for b in bounds[1:]]
+    his[-1] = n
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_range_product, los, his))
+    return _product_tree(parts)
+
+
+def factorial(n: int, workers: Optional[int] = None) -> FactorialResult:
+    """Exact n! for a non-negative integer n.
+
+    workers > 1 spreads the product over a process pool when gmpy2 is not
+    available and n is at least PARALLEL_THRESHOLD.
+    """
+    if not isinstance(n, int) or n < 0:
+        raise ValueError("Factorial requires a non-negative integer")
+    if gmpy2 is not None and n > 1000:
+        return FactorialResult(gmpy2.fac(n))
+    if workers and workers > 1 and n >= PARALLEL_THRESHOLD:
+        return FactorialResult(_parallel_factorial(n, workers))
+    return FactorialResult(math.factorial(n))
+
+
+@lru_cache(maxsize=None)
+def _bernoulli(k: int) -> Fraction:
+    """Bernoulli number B_k (Akiyama-Tanigawa), exact."""
+    a = [Fraction(0)] * (k + 1)
+    for m in range(k + 1):
+        a[m] = Fraction(1, m + 1)
+        for j in range(m, 0, -1):
+            a[j - 1] = j * (a[j - 1] - a[j])
+    return a[0]
+
+
+def _stirling_ln_factorial(n: int, ctx: decimal.Context) -> decimal.Decimal:
+    """ln(n!) from the Stirling series, accurate to ctx.prec digits for large n."""
+    from .backends import decimal_pi
+
+    wp = decimal.Context(prec=ctx.prec + 10, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+    dn = wp.create_decimal(n)
+    ln_n = wp.ln(dn)
+    total = wp.subtract(wp.multiply(dn, ln_n), dn)
+    two_pi_n = wp.multiply(wp.multiply(2, decimal_pi(wp.prec)), dn)
+    total = wp.add(total, wp.divide(wp.ln(two_pi_n), 2))
+    epsilon = wp.create_decimal(10) ** -(wp.prec)
+    n_power = dn
+    n_squared = wp.multiply(dn, dn)
+    k = 1
+    while True:
+        b = _bernoulli(2 * k)
+        term = wp.divide(wp.create_decimal(b.numerator),
+                         wp.multiply(b.denominator * (2 * k) * (2 * k - 1), n_power))
+        total = wp.add(total, term)
+        if term.copy_abs() < epsilon or k > 200:
+            break
+        n_power = wp.multiply(n_power, n_squared)
+        k += 1
+    return ctx.plus(total)
+
+
+def log_factorial(n: int, backend=None):
+    """ln(n!) without computing n!.
+
+    Uses ``math.lgamma`` for the float backend; for a decimal backend the
+    exact logarithm for small n and the Stirling series otherwise.
+    """
+    if not isinstance(n, int) or n < 0:
+        raise ValueError("Factorial requires a non-negative integer")
+    if backend is None or backend.name == "float":
+        return math.lgamma(n + 1)
+    ctx = backend.context
+    if n < 4 * ctx.prec:
+        return ctx.ln(ctx.create_decimal(math.factorial(n))) if n > 1 else ctx.create_decimal(0)
+    return _stirling_ln_factorial(n, ctx)
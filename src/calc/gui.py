@@ -1,7 +1,19 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import math
+from . import metrics
 from .calculator import Calculator
+from .factorial import FactorialResult
+
+
+def _number_text(value):
+    """Display text for a number; huge exact integers are abbreviated."""
+    if isinstance(value, int):
+        return str(FactorialResult(value))
+    if value == int(value):
+        return str(int(value))
+    return str(value)
+
 
 class CalculatorGUI:
     def __init__(self, root):
@@ -188,10 +200,7 @@ class CalculatorGUI:
     def _add_constant(self, value):
         """Add a mathematical constant like pi or e"""
         self.calc.add(0, value)
-        if value == int(value):
-            self.display_var.set(str(int(value)))
-        else:
-            self.display_var.set(str(value))
+        self.display_var.set(_number_text(value))
         self.current_input = ""
         self.operation_pending = True
     
@@ -240,10 +249,7 @@ class CalculatorGUI:
                     result = self.calc.add(0, value)
                     
                 # Format result
-                if result == int(result):
-                    self.display_var.set(str(int(result)))
-                else:
-                    self.display_var.set(str(result))
+                self.display_var.set(_number_text(result))
                     
                 self.current_input = ""
                 self.operation_pending = True
@@ -272,10 +278,7 @@ class CalculatorGUI:
             result = func()
             
             # Format result
-            if result == int(result):
-                self.display_var.set(str(int(result)))
-            else:
-                self.display_var.set(str(result))
+            self.display_var.set(_number_text(result))
                 
             self.current_input = ""
             self.operation_pending = True
@@ -305,10 +308,7 @@ class CalculatorGUI:
         
     def _memory_recall(self):
         value = self.calc.memory_recall()
-        if value == int(value):
-            self.display_var.set(str(int(value)))
-        else:
-            self.display_var.set(str(value))
+        self.display_var.set(_number_text(value))
         self.current_input = ""
         self._update_memory_display()
         
@@ -347,10 +347,7 @@ class CalculatorGUI:
         self._update_memory_display()
         
     def _update_memory_display(self):
-        if self.calc.memory == int(self.calc.memory):
-            self.memory_status.config(text=f"Memory: {int(self.calc.memory)}")
-        else:
-            self.memory_status.config(text=f"Memory: {self.calc.memory}")
+        self.memory_status.config(text=f"Memory: {_number_text(self.calc.memory)}")
     
     def _key_press(self, event):
         key = event.char
@@ -376,6 +373,13 @@ class CalculatorGUI:
         elif event.keysym == "Escape":
             self._all_clear()
             
+metrics.register(CalculatorGUI, [
+    "_add_constant", "_add_digit", "_set_operation", "_calculate", "_scientific_func",
+    "_clear", "_all_clear", "_memory_clear", "_memory_recall", "_memory_store",
+    "_memory_add", "_memory_subtract", "_key_press",
+], "gui.{}")
+
+
 def run():
     root = tk.Tk()
     app = CalculatorGUI(root)
@@ -0,0 +1,106 @@
+"""
+Stateless operation kernel.
+
+Every function here is pure: it takes its operands (and optionally a numeric
+backend), checks the domain exactly as Calculator always has, and returns the
+result.  Nothing is stored anywhere, so one kernel is shared lock-free by any
+number of threads and sessions.  Chaining on ``last_result`` and the memory
+register live in ``calc.session.CalculatorSession``.
+
+Example::
+
+    from calc import kernel
+    kernel.divide(10, 4)      # 2.5
+    kernel.square_root(-1)    # ValueError
+"""
+from typing import Any
+
+from .backends import get_backend
+from .factorial import FactorialResult, factorial as _factorial, log_factorial as _log_factorial
+
+FLOAT = get_backend("float")
+
+
+def add(a: Any, b: Any, backend: Any = FLOAT) -> Any:
+    """a + b."""
+    return backend.add(a, b)
+
+
+def subtract(a: Any, b: Any, backend: Any = FLOAT) -> Any:
+    """a - b."""
+    return backend.subtract(a, b)
+
+
+def multiply(a: Any, b: Any, backend: Any = FLOAT) -> Any:
+    """a * b."""
+    return backend.multiply(a, b)
+
+
+def divide(a: Any, b: Any, backend: Any = FLOAT) -> Any:
+    """a / b; raises ZeroDivisionError for b == 0."""
+    if b == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+    return backend.divide(a, b)
+
+
+def power(a: Any, b: Any, backend: Any = FLOAT) -> Any:
+    """a raised to the power b."""
+    return backend.power(a, b)
+
+
+def modulo(a: Any, b: Any, backend: Any = FLOAT) -> Any:
+    """Remainder of a / b with the sign of b; raises ZeroDivisionError for b == 0."""
+    if b == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+    return backend.modulo(a, b)
+
+
+def square_root(a: Any, backend: Any = FLOAT) -> Any:
+    """Square root; raises ValueError for negative a."""
+    if a < 0:
+        raise ValueError("Cannot calculate square root of negative number")
+    return backend.sqrt(a)
+
+
+def sin(angle: Any, backend: Any = FLOAT) -> Any:
+    """Sine of an angle in radians."""
+    return backend.sin(angle)
+
+
+def cos(angle: Any, backend: Any = FLOAT) -> Any:
+    """Cosine of an angle in radians."""
+    return backend.cos(angle)
+
+
+def tan(angle: Any, backend: Any = FLOAT) -> Any:
+    """Tangent of an angle in radians."""
+    return backend.tan(angle)
+
+
+def log10(a: Any, backend: Any = FLOAT) -> Any:
+    """Base-10 logarithm; raises ValueError for non-positive a."""
+    if a <= 0:
+        raise ValueError("Cannot calculate logarithm of non-positive number")
+    return backend.log10(a)
+
+
+def ln(a: Any, backend: Any = FLOAT) -> Any:
+    """Natural logarithm; raises ValueError for non-positive a."""
+    if a <= 0:
+        raise ValueError("Cannot calculate logarithm of non-positive number")
+    return backend.ln(a)
+
+
+def exp(a: Any, backend: Any = FLOAT) -> Any:
+    """e raised to the power a."""
+    return backend.exp(a)
+
+
+def factorial(n: int, backend: Any = FLOAT) -> FactorialResult:
+    """Exact n!; raises ValueError unless n is a non-negative int."""
+    return _factorial(n)
+
+
+def log_factorial(n: int, backend: Any = FLOAT) -> Any:
+    """ln(n!) without computing n!."""
+    return _log_factorial(n, backend)
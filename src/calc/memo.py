@@ -0,0 +1,172 @@
+"""
+Bounded caches with LRU and LFU eviction.
+
+Used for the opt-in memoization layer on ``Calculator`` and for the compiled
+expression cache in ``calc.expr``.  Both caches keep hit, miss and eviction
+counters and perform every operation in O(1).
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple
+
+# Returned by get() when a key is not cached
+MISSING = object()
+
+POLICIES = ('lru', 'lfu')
+
+
+class CacheStats(NamedTuple):
+    policy: str
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class LRUCache:
+    """Evicts the least recently used entry when full."""
+
+    policy = 'lru'
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Return the cached value for key, counting a hit or a miss."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache value under key, evicting if the cache is full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._evict()
+
+    def resize(self, maxsize: int) -> None:
+        """Change the capacity, evicting entries if needed."""
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.maxsize = maxsize
+        self._evict()
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.policy, self.hits, self.misses, self.evictions,
+                          len(self._data), self.maxsize)
+
+    def _evict(self) -> None:
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+class LFUCache:
+    """Evicts the least frequently used entry when full (ties: least recent)."""
+
+    policy = 'lfu'
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._values: Dict[Hashable, Any] = {}
+        self._counts: Dict[Hashable, int] = {}
+        # use count -> keys with that count, oldest first
+        self._buckets: "Dict[int, OrderedDict[Hashable, None]]" = {}
+        self._min_count = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Return the cached value for key, counting a hit or a miss."""
+        try:
+            value = self._values[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._touch(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache value under key, evicting if the cache is full."""
+        if key in self._values:
+            self._values[key] = value
+            self._touch(key)
+            return
+        if len(self._values) >= self.maxsize:
+            self._evict_one()
+        self._values[key] = value
+        self._counts[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_count = 1
+
+    def resize(self, maxsize: int) -> None:
+        """Change the capacity, evicting entries if needed."""
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.maxsize = maxsize
+        while len(self._values) > maxsize:
+            self._evict_one()
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._values.clear()
+        self._counts.clear()
+        self._buckets.clear()
+        self._min_count = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.policy, self.hits, self.misses, self.evictions,
+                          len(self._values), self.maxsize)
+
+    def _touch(self, key: Hashable) -> None:
+        count = self._counts[key]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def _evict_one(self) -> None:
+        if not self._buckets.get(self._min_count):
+            self._min_count = min(self._buckets)
+        bucket = self._buckets[self._min_count]
+        key, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self._buckets[self._min_count]
+        del self._values[key]
+        del self._counts[key]
+        self.evictions += 1
+
+
+def make_cache(policy: str = 'lru', maxsize: int = 1024):
+    """Create an empty cache with the given eviction policy."""
+    if policy == 'lru':
+        return LRUCache(maxsize)
+    if policy == 'lfu':
+        return LFUCache(maxsize)
+    raise ValueError(f"Unknown eviction policy: {policy!r} (expected one of {POLICIES})")
@@ -0,0 +1,294 @@
+"""
+Opt-in operation metrics.
+
+Calls, errors (by exception type) and a latency histogram are kept for every
+Calculator method and for the ``mycalc --batch`` and GUI dispatchers::
+
+    from calc import metrics
+    metrics.enable()
+    ...
+    calc.stats()                      # {"calculator.divide": {"calls": ..., ...}}
+    metrics.start_exporter("calc.prom", interval=10)   # or "calc.json"
+
+Instrumentation works by replacing the methods on their class (or module)
+with timing wrappers while enabled, and putting the originals back on
+``disable()``.  Disabled, nothing is wrapped at all, so there is no cost per
+call.  Modules declare what they want measured with ``register()``.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# Upper bounds of the latency histogram buckets, in seconds (+Inf is implicit)
+BUCKETS: Tuple[float, ...] = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+FORMATS = ("prometheus", "json")
+
+# Metric name: a format string taking the attribute name, or a function of
+# the call's arguments (for dispatchers whose operation is an argument)
+MetricName = Union[str, Callable[..., str]]
+
+
+class OperationMetrics:
+    """Counters and latency histogram of one operation."""
+
+    __slots__ = ("calls", "errors", "seconds", "buckets")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.seconds = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, elapsed: float, error: Optional[BaseException] = None) -> None:
+        """Count one call that took elapsed seconds (and raised error)."""
+        with _lock:
+            self.calls += 1
+            self.seconds += elapsed
+            self.buckets[bisect_left(BUCKETS, elapsed)] += 1
+            if error is not None:
+                kind = type(error).__name__
+                self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def clear(self) -> None:
+        self.calls = 0
+        self.errors = {}
+        self.seconds = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = []
+        total = 0
+        for count in self.buckets:
+            total += count
+            cumulative.append(total)
+        return {
+            "calls": self.calls,
+            "errors": dict(self.errors),
+            "error_count": sum(self.errors.values()),
+            "seconds": self.seconds,
+            "mean_seconds": self.seconds / self.calls if self.calls else 0.0,
+            "p50_seconds": self._quantile(cumulative, 0.5),
+            "p99_seconds": self._quantile(cumulative, 0.99),
+            "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], cumulative)),
+        }
+
+    def _quantile(self, cumulative: List[int], fraction: float) -> Optional[float]:
+        """Upper bucket bound below which fraction of the calls fall."""
+        if not self.calls:
+            return None
+        rank = fraction * self.calls
+        for bound, count in zip(BUCKETS, cumulative):
+            if count >= rank:
+                return bound
+        return float("inf")
+
+
+_lock = threading.RLock()
+_metrics: Dict[str, OperationMetrics] = {}
+# (owner, attribute, metric name) declared by the instrumented modules
+_targets: List[Tuple[Any, str, MetricName]] = []
+# (owner, attribute) -> original while enabled
+_originals: Dict[Tuple[int, str], Tuple[Any, str, Any]] = {}
+_enabled = False
+_exporter: Optional["_Exporter"] = None
+
+
+def metric(name: str) -> OperationMetrics:
+    """The metrics object of operation name, created on first use."""
+    with _lock:
+        found = _metrics.get(name)
+        if found is None:
+            found = _metrics[name] = OperationMetrics()
+        return found
+
+
+def _wrap(func: Callable, name: MetricName) -> Callable:
+    clock = time.perf_counter
+    if isinstance(name, str):
+        observe = metric(name).observe
+
+        @wraps(func)
+        def instrumented(*args: Any, **kwargs: Any) -> Any:
+            start = clock()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                observe(clock() - start, e)
+                raise
+            observe(clock() - start)
+            return result
+    else:
+        @wraps(func)
+        def instrumented(*args: Any, **kwargs: Any) -> Any:
+            start = clock()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                metric(name(*args)).observe(clock() - start, e)
+                raise
+            metric(name(*args)).observe(clock() - start)
+            return result
+
+    return instrumented
+
+
+def _patch(owner: Any, attribute: str, name: MetricName) -> None:
+    key = (id(owner), attribute)
+    if key in _originals:
+        return
+    original = owner.__dict__[attribute] if isinstance(owner, type) else getattr(owner, attribute)
+    if isinstance(name, str):
+        name = name.format(attribute.lstrip("_"))
+    _originals[key] = (owner, attribute, original)
+    setattr(owner, attribute, _wrap(original, name))
+
+
+def register(owner: Any, attributes: List[str], name: MetricName) -> None:
+    """Declare methods of a class (or functions of a module) to measure.
+
+    name is a format string receiving the attribute name without leading
+    underscores (``"calculator.{}"``), or a function of the call arguments
+    returning the metric name.  Takes effect immediately if enabled.
+    """
+    with _lock:
+        for attribute in attributes:
+            _targets.append((owner, attribute, name))
+            if _enabled:
+                _patch(owner, attribute, name)
+
+
+def enable() -> None:
+    """Start measuring every registered operation."""
+    global _enabled
+    with _lock:
+        _enabled = True
+        for owner, attribute, name in _targets:
+            _patch(owner, attribute, name)
+
+
+def disable() -> None:
+    """Stop measuring and restore the original methods; counts are kept."""
+    global _enabled
+    with _lock:
+        _enabled = False
+        for owner, attribute, original in _originals.values():
+            setattr(owner, attribute, original)
+        _originals.clear()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """Zero all counts."""
+    with _lock:
+        for found in _metrics.values():
+            found.clear()
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Calls, errors and latency of every operation measured so far."""
+    with _lock:
+        return {name: found.snapshot() for name, found in sorted(_metrics.items()) if found.calls}
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(snapshot: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    """Prometheus text exposition of stats()."""
+    snapshot = stats() if snapshot is None else snapshot
+    lines = [
+        "# HELP calc_operation_calls_total Calls of each calculator operation.",
+        "# TYPE calc_operation_calls_total counter",
+    ]
+    for name, data in snapshot.items():
+        lines.append(f'calc_operation_calls_total{{operation="{_label(name)}"}} {data["calls"]}')
+    lines += [
+        "# HELP calc_operation_errors_total Calls that raised, by exception type.",
+        "# TYPE calc_operation_errors_total counter",
+    ]
+    for name, data in snapshot.items():
+        for kind, count in sorted(data["errors"].items()):
+            lines.append(f'calc_operation_errors_total{{operation="{_label(name)}",type="{_label(kind)}"}} {count}')
+    lines += [
+        "# HELP calc_operation_seconds Latency of each calculator operation.",
+        "# TYPE calc_operation_seconds histogram",
+    ]
+    for name, data in snapshot.items():
+        label = _label(name)
+        for bound, count in data["buckets"].items():
+            lines.append(f'calc_operation_seconds_bucket{{operation="{label}",le="{bound}"}} {count}')
+        lines.append(f'calc_operation_seconds_sum{{operation="{label}"}} {data["seconds"]!r}')
+        lines.append(f'calc_operation_seconds_count{{operation="{label}"}} {data["calls"]}')
+    return "\n".join(lines) + "\n"
+
+
+def to_json(snapshot: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    """JSON document of stats() with a timestamp."""
+    snapshot = stats() if snapshot is None else snapshot
+    return json.dumps({"time": time.time(), "operations": snapshot}, indent=2, sort_keys=True) + "\n"
+
+
+def dump(path: str, fmt: Optional[str] = None) -> None:
+    """Write the current stats to path atomically.
+
+    fmt defaults to "json" for a ``.json`` path and "prometheus" otherwise.
+    """
+    if fmt is None:
+        fmt = "json" if path.endswith(".json") else "prometheus"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown metrics format: {fmt!r} (expected one of {FORMATS})")
+    text = to_json() if fmt == "json" else to_prometheus()
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, "w") as f:
+        f.write(text)
+    os.replace(temp, path)
+
+
+class _Exporter(threading.Thread):
+    def __init__(self, path: str, fmt: Optional[str], interval: float) -> None:
+        super().__init__(name="calc-metrics-exporter", daemon=True)
+        self.path = path
+        self.fmt = fmt
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            dump(self.path, self.fmt)
+
+
+def start_exporter(path: str, fmt: Optional[str] = None, interval: float = 10.0) -> None:
+    """Enable metrics and dump them to path every interval seconds.
+
+    A final dump is written by ``stop_exporter()``.
+    """
+    global _exporter
+    stop_exporter()
+    if fmt is None:
+        fmt = "json" if path.endswith(".json") else "prometheus"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown metrics format: {fmt!r} (expected one of {FORMATS})")
+    enable()
+    _exporter = _Exporter(path, fmt, interval)
+    _exporter.start()
+
+
+def stop_exporter() -> None:
+    """Stop the periodic dump, writing the file one last time."""
+    global _exporter
+    if _exporter is not None:
+        _exporter.stopped.set()
+        _exporter.join()
+        dump(_exporter.path, _exporter.fmt)
+        _exporter = None
@@ -0,0 +1,216 @@
+"""
+Multi-process evaluation of large command files (``mycalc --batch --jobs N``).
+
+The input is cut into chunks of about ``chunk_bytes`` and each chunk is run
+by ``cli.run_commands`` in a worker process.  A chunk may only end just
+before a line that starts a new chain -- a command with all its operands
+given (``add 2 3``, ``sqrt 9``) or ``clear`` -- so a run of commands that
+chain on ``last_result`` always stays in one worker.  In ``--expr`` mode
+every line is independent.
+
+The parent only reads the file to find chunk boundaries and count lines;
+workers read and evaluate their own byte range and return formatted output,
+which the parent writes in the original order.
+
+Each chunk starts with a fresh calculator, so the memory register (``m+``,
+``mr``) does not carry over from one chunk to the next.  Files that use
+memory across chains should be run without ``--jobs``.
+"""
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, BinaryIO, Deque, Iterator, List, NamedTuple, Optional, Tuple
+
+from .cli import (BINARY_COMMANDS, COMMAND_MAP, ERROR_POLICIES, FORMATS, UNARY_COMMANDS,
+                  BatchSummary, run_commands, run_expressions, write_records)
+
+# Target chunk size; a chunk grows past it until the next chain starts
+CHUNK_BYTES = 1 << 22
+
+
+class ChunkTask(NamedTuple):
+    """A byte range of the input and how to evaluate it."""
+    index: int
+    first_line: int
+    start: int
+    end: int
+    path: Optional[str]
+    data: Optional[bytes]  # the chunk itself when the input is not a seekable file
+    fmt: str
+    on_error: str
+    expressions: bool
+
+
+class ChunkResult(NamedTuple):
+    """Output and totals of one chunk, in input order."""
+    index: int
+    first_line: int
+    lines: int
+    output: str
+    summary: BatchSummary
+    exited: bool = False            # the chunk contained an ``exit`` command
+    failure: Optional[str] = None   # the worker itself failed on this chunk
+
+    @property
+    def last_line(self) -> int:
+        return self.first_line + self.lines - 1
+
+
+def starts_chain(line: bytes) -> bool:
+    """True if the command on line does not depend on the previous result."""
+    parts = line.split()
+    if not parts:
+        return False
+    main_cmd = COMMAND_MAP.get(parts[0].decode(errors='replace').lower())
+    if main_cmd in BINARY_COMMANDS:
+        return len(parts) >= 3
+    if main_cmd in UNARY_COMMANDS:
+        return len(parts) >= 2
+    return main_cmd == 'clear'
+
+
+def split_chunks(source: BinaryIO, chunk_bytes: int = CHUNK_BYTES,
+                 expressions: bool = False) -> Iterator[Tuple[int, int, int, bytes]]:
+    """Yield (first line, start offset, end offset, data) for each chunk of source."""
+    position = 0
+    line_number = 1
+    carry = b""
+    while True:
+        data = carry + source.read(max(chunk_bytes - len(carry), 1))
+        carry = b""
+        if not data:
+            return
+        if not data.endswith(b"\n"):
+            data += source.readline()
+        if not expressions:
+            # Extend to the start of the next chain
+            while True:
+                line = source.readline()
+                if not line or starts_chain(line):
+                    carry = line
+                    break
+                data += line
+        end = position + len(data)
+        yield line_number, position, end, data
+        line_number += data.count(b"\n")
+        position = end
+
+
+def _exhaust(lines, done: list):
+    yield from lines
+    done.append(True)
+
+
+def run_chunk(task: ChunkTask) -> ChunkResult:
+    """Evaluate one chunk (in a worker process)."""
+    data = task.data
+    if data is None:
+        with open(task.path, 'rb') as f:
+            f.seek(task.start)
+            data = f.read(task.end - task.start)
+    lines = data.split(b"\n")
+    if not lines[-1]:
+        lines.pop()
+    out = io.StringIO()
+    try:
+        lines = [line.decode() for line in lines]
+        done: List[bool] = []
+        if task.expressions:
+            records = run_expressions(_exhaust(lines, done), task.first_line)
+        else:
+            records = run_commands(_exhaust(lines, done), first_line=task.first_line)
+        summary = write_records(records, out, task.fmt, task.on_error)
+    except Exception as e:  # report the chunk instead of losing the whole run
+        return ChunkResult(task.index, task.first_line, len(lines), "",
+                           BatchSummary(0, 0, 0, 0.0, False), failure=f"{type(e).__name__}: {e}")
+    exited = not done and not summary.stopped
+    return ChunkResult(task.index, task.first_line, len(lines), out.getvalue(), summary, exited)
+
+
+def evaluate_file(path: str, jobs: Optional[int] = None, fmt: str = 'text', on_error: str = 'emit',
+                  expressions: bool = False, chunk_bytes: int = CHUNK_BYTES,
+                  source: Optional[BinaryIO] = None) -> Iterator[ChunkResult]:
+    """Evaluate a command file on jobs processes, yielding chunk results in order.
+
+    path '-' (or an explicit binary source) sends the chunk data to the
+    workers instead of letting them read the file.  Iteration stops after a
+    chunk that hit ``exit`` or, with on_error='stop', an error.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt!r}")
+    if on_error not in ERROR_POLICIES:
+        raise ValueError(f"Unknown error policy: {on_error!r}")
+    jobs = jobs or os.cpu_count() or 1
+    own_source = source is None and path != '-'
+    if source is None:
+        source = open(path, 'rb') if own_source else sys.stdin.buffer
+    by_offset = own_source
+
+    def tasks() -> Iterator[ChunkTask]:
+        for index, (first_line, start, end, data) in enumerate(split_chunks(source, chunk_bytes, expressions)):
+            yield ChunkTask(index, first_line, start, end, path if by_offset else None,
+                            None if by_offset else data, fmt, on_error, expressions)
+
+    try:
+        if jobs == 1:
+            for task in tasks():
+                result = run_chunk(task)
+                yield result
+                if _is_last(result, on_error):
+                    return
+            return
+        with ProcessPoolExecutor(jobs) as pool:
+            in_flight: Deque[Future] = deque()
+            pending = tasks()
+            for task in pending:
+                in_flight.append(pool.submit(run_chunk, task))
+                if len(in_flight) >= 2 * jobs:
+                    break
+            while in_flight:
+                result = in_flight.popleft().result()
+                yield result
+                if _is_last(result, on_error):
+                    for future in in_flight:
+                        future.cancel()
+                    return
+                task = next(pending, None)
+                if task is not None:
+                    in_flight.append(pool.submit(run_chunk, task))
+    finally:
+        if own_source:
+            source.close()
+
+
+def _is_last(result: ChunkResult, on_error: str) -> bool:
+    return result.exited or result.summary.stopped or (result.failure is not None and on_error == 'stop')
+
+
+def run_file(path: str, out: IO[str], jobs: Optional[int] = None, fmt: str = 'text',
+             on_error: str = 'emit', expressions: bool = False,
+             chunk_bytes: int = CHUNK_BYTES) -> BatchSummary:
+    """Evaluate path in parallel, write results to out in order and summarize."""
+    start = time.perf_counter()
+    commands = ok = errors = 0
+    stopped = False
+    for result in evaluate_file(path, jobs, fmt, on_error, expressions, chunk_bytes):
+        if result.failure is not None:
+            errors += 1
+            if on_error != 'skip':
+                if fmt == 'jsonl':
+                    out.write(json.dumps({"lines": [result.first_line, result.last_line],
+                                          "error": result.failure, "type": "ChunkFailure"}) + "\n")
+                else:
+                    out.write(f"error lines {result.first_line}-{result.last_line}: {result.failure}\n")
+            stopped = stopped or on_error == 'stop'
+            continue
+        out.write(result.output)
+        commands += result.summary.commands
+        ok += result.summary.ok
+        errors += result.summary.errors
+        stopped = stopped or result.summary.stopped
+    out.flush()
+    return BatchSummary(commands, ok, errors, time.perf_counter() - start, stopped)
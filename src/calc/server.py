@@ -0,0 +1,404 @@
+"""
+Network calculator server (``calc serve``).
+
+An asyncio server speaking newline-delimited JSON over TCP or a Unix socket.
+Every line is one request object, or a JSON list of them (a batch, answered
+by one list)::
+
+    {"id": 1, "op": "add", "args": [2, 3]}
+    {"id": 2, "op": "sqrt"}
+    [{"op": "mul", "args": [4]}, {"op": "m+"}]
+
+and is answered by one line, in order::
+
+    {"id": 1, "result": 5}
+    {"id": 2, "result": 2.23606797749979}
+    [{"result": 8.94427190999916}, {"result": 8.94427190999916}]
+
+Failures come back as ``{"id": ..., "error": "...", "type": "ValueError"}``.
+Each connection has its own session (last result and memory); a request with
+``"session": "name"`` uses a named session instead, shared by every
+connection that names it.  ``op`` is a Calculator method name or any
+``mycalc`` command alias.
+
+Clients may pipeline: everything that arrives in one read is answered with
+one write.  Heavy work -- large factorials and huge integer powers -- runs in
+a process pool, so one big request never stalls other connections; later
+requests on the same connection wait for it so replies stay in order.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import stat
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from decimal import Decimal
+from functools import partial
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Set, Union
+
+from . import kernel, metrics
+from .backends import get_backend
+from .calculator import Calculator
+from .cli import BINARY_COMMANDS, COMMAND_MAP, UNARY_COMMANDS
+from .factorial import FactorialResult
+from .memo import MISSING, LRUCache
+from .session import CalculatorSession
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7878
+
+# factorial(n) from this n on, and integer powers whose result would exceed
+# this many bits, are computed in the process pool
+HEAVY_FACTORIAL = 20000
+HEAVY_POWER_BITS = 1 << 20
+
+# Request op -> Calculator method ("result" reads last_result)
+OPERATIONS: Dict[str, str] = {name: name for name in (
+    "add", "subtract", "multiply", "divide", "power", "modulo", "square_root",
+    "sin", "cos", "tan", "log10", "ln", "exp", "factorial", "log_factorial",
+    "clear", "memory_store", "memory_recall", "memory_clear", "memory_add",
+    "memory_subtract", "result",
+)}
+OPERATIONS.update({"pow": "power", "mod": "modulo", "ms": "memory_store"})
+_MISC_COMMANDS = {
+    "result": "result", "clear": "clear", "m+": "memory_add",
+    "m-": "memory_subtract", "mr": "memory_recall", "mc": "memory_clear",
+}
+for _alias, _main_cmd in COMMAND_MAP.items():
+    _method = BINARY_COMMANDS.get(_main_cmd) or UNARY_COMMANDS.get(_main_cmd) or _MISC_COMMANDS.get(_main_cmd)
+    if _method is not None:
+        OPERATIONS.setdefault(_alias, _method)
+
+_ERRORS = (ArithmeticError, ValueError, LookupError, TypeError)
+_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _encode(value: Any) -> Any:
+    """Make a result JSON-safe without losing exactness."""
+    if isinstance(value, int) and not isinstance(value, bool) and value.bit_length() > 53:
+        return str(FactorialResult(value))  # exact digits, or scientific when enormous
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _error(request_id: Any, exc: BaseException) -> Dict[str, Any]:
+    return {"id": request_id, "error": str(exc), "type": type(exc).__name__}
+
+
+class _Deferred(NamedTuple):
+    """A request whose computation has to leave the event loop."""
+    request_id: Any
+    calc: Calculator
+    func: Any
+    args: tuple
+    convert: Any = None  # applied to the result before it becomes last_result
+
+
+class CalcServer:
+    """Sessions, request dispatch and listeners of one calculator server.
+
+    executor runs the heavy requests; by default a process pool of workers
+    processes is created on first use.
+    """
+
+    def __init__(self, backend: Union[str, Any] = "float", precision: Optional[int] = None,
+                 max_sessions: int = 100000, executor: Optional[Executor] = None,
+                 workers: Optional[int] = None) -> None:
+        self.backend = get_backend(backend, precision)
+        self.sessions = LRUCache(max_sessions)
+        self.requests = 0
+        self._executor = executor
+        self._own_executor = executor is None
+        self._workers = workers
+        self._servers: List[asyncio.AbstractServer] = []
+        self._connections: Set["_Connection"] = set()
+        if self.backend.name == "decimal":
+            self._loads = partial(json.loads, parse_float=Decimal)
+        else:
+            self._loads = json.loads
+
+    def session(self, session_id: Any) -> CalculatorSession:
+        """The named session session_id, created on first use.
+
+        Only the max_sessions most recently used named sessions are kept.
+        """
+        session = self.sessions.get(session_id)
+        if session is MISSING:
+            session = CalculatorSession()
+        self.sessions.put(session_id, session)
+        return session
+
+    def new_calculator(self) -> Calculator:
+        """A calculator on a fresh session, as given to each connection."""
+        return Calculator(self.backend, session=CalculatorSession())
+
+    # Request handling
+    def handle(self, request: Any, calc: Calculator) -> Union[Dict[str, Any], _Deferred]:
+        """Execute one request object and return its reply object.
+
+        Returns a _Deferred instead when the work belongs in the executor.
+        """
+        self.requests += 1
+        if not isinstance(request, dict):
+            return _error(None, TypeError("Request must be a JSON object"))
+        request_id = request.get("id")
+        try:
+            op = request.get("op")
+            method = OPERATIONS.get(op) if isinstance(op, str) else None
+            if method is None:
+                raise LookupError(f"Unknown operation: {op!r}")
+            args = request.get("args")
+            if args is None:
+                args = []
+            elif not isinstance(args, list):
+                args = [args]
+            session_id = request.get("session")
+            if session_id is not None:
+                calc = Calculator(self.backend, session=self.session(session_id))
+            if method == "result":
+                return {"id": request_id, "result": _encode(calc.last_result)}
+            if method in ("factorial", "log_factorial") and args and isinstance(args[0], float) \
+                    and args[0].is_integer():
+                args[0] = int(args[0])
+            deferred = self._heavy(request_id, calc, method, args)
+            if deferred is not None:
+                return deferred
+            result = getattr(calc, method)(*args)
+        except _ERRORS as e:
+            return _error(request_id, e)
+        return {"id": request_id, "result": _encode(result)}
+
+    def _heavy(self, request_id: Any, calc: Calculator, method: str, args: list) -> Optional[_Deferred]:
+        if method == "factorial":
+            n = args[0] if args else calc.last_result
+            if isinstance(n, float) and n.is_integer():
+                n = int(n)
+            if isinstance(n, int) and n >= HEAVY_FACTORIAL:
+                return _Deferred(request_id, calc, kernel.factorial, (n,), calc.backend.from_int)
+        elif method == "power" and args:
+            a, b = (calc.last_result, args[0]) if len(args) == 1 else args[:2]
+            if isinstance(a, int) and isinstance(b, int) and b > 0 \
+                    and a.bit_length() * b > HEAVY_POWER_BITS:
+                return _Deferred(request_id, calc, kernel.power, (a, b, calc.backend))
+        return None
+
+    async def _complete(self, deferred: _Deferred) -> Dict[str, Any]:
+        """Run deferred work in the executor and apply it to its session."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self._workers)
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._executor, deferred.func, *deferred.args)
+        except _ERRORS as e:
+            return _error(deferred.request_id, e)
+        convert = deferred.convert
+        deferred.calc.last_result = result if convert is None else convert(result)
+        return {"id": deferred.request_id, "result": _encode(result)}
+
+    def handle_line(self, line: bytes, calc: Calculator) -> Any:
+        """Answer one frame: reply bytes, a coroutine producing them, or None for a blank line."""
+        if not line.strip():
+            return None
+        try:
+            frame = self._loads(line)
+        except ValueError as e:
+            return _dumps(_error(None, ValueError(f"Invalid JSON: {e}"))).encode() + b"\n"
+        if isinstance(frame, list):
+            replies = []
+            requests = iter(frame)
+            for request in requests:
+                reply = self.handle(request, calc)
+                if isinstance(reply, _Deferred):
+                    return self._finish_batch(replies, reply, requests, calc)
+                replies.append(reply)
+            return _dumps(replies).encode() + b"\n"
+        reply = self.handle(frame, calc)
+        if isinstance(reply, _Deferred):
+            return self._finish_one(reply)
+        return _dumps(reply).encode() + b"\n"
+
+    async def _finish_one(self, deferred: _Deferred) -> bytes:
+        return _dumps(await self._complete(deferred)).encode() + b"\n"
+
+    async def _finish_batch(self, replies: list, deferred: _Deferred, rest, calc: Calculator) -> bytes:
+        replies.append(await self._complete(deferred))
+        for request in rest:
+            reply = self.handle(request, calc)
+            if isinstance(reply, _Deferred):
+                reply = await self._complete(reply)
+            replies.append(reply)
+        return _dumps(replies).encode() + b"\n"
+
+    # Listeners
+    async def start_tcp(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """Listen on a TCP address (port 0 picks a free port)."""
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(lambda: _Connection(self), host, port)
+        self._servers.append(server)
+        return server
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        """Listen on a Unix domain socket."""
+        loop = asyncio.get_running_loop()
+        server = await loop.create_unix_server(lambda: _Connection(self), path)
+        self._servers.append(server)
+        return server
+
+    async def close(self) -> None:
+        """Stop listening, drop open connections and shut down the executor."""
+        for server in self._servers:
+            server.close()
+        for connection in list(self._connections):
+            connection.transport.close()
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers.clear()
+        if self._executor is not None and self._own_executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class _Connection(asyncio.Protocol):
+    """One client connection: splits lines, answers them in order, writes in bulk."""
+
+    def __init__(self, server: CalcServer) -> None:
+        self.server = server
+        self.calc = server.new_calculator()
+        self.transport: Optional[asyncio.Transport] = None
+        self._buffer = b""
+        self._pending: Deque[bytes] = deque()
+        self._busy = False
+        self._eof = False
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+        self.server._connections.add(self)
+        sock = transport.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def data_received(self, data: bytes) -> None:
+        lines = (self._buffer + data).split(b"\n")
+        self._buffer = lines.pop()
+        self._pending.extend(lines)
+        if not self._busy:
+            self._drain()
+
+    def eof_received(self) -> bool:
+        if self._buffer:
+            self._pending.append(self._buffer)
+            self._buffer = b""
+        self._eof = True
+        if not self._busy:
+            self._drain()
+        return True  # keep the transport open until pending replies are written
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._pending.clear()
+        self.server._connections.discard(self)
+        self.transport = None
+
+    # Backpressure: stop reading requests while the client is not reading replies
+    def pause_writing(self) -> None:
+        self.transport.pause_reading()
+
+    def resume_writing(self) -> None:
+        self.transport.resume_reading()
+
+    def _drain(self) -> None:
+        handle_line = self.server.handle_line
+        calc = self.calc
+        pending = self._pending
+        out = []
+        while pending:
+            reply = handle_line(pending.popleft(), calc)
+            if reply is None:
+                continue
+            if isinstance(reply, bytes):
+                out.append(reply)
+            else:
+                self._busy = True
+                asyncio.ensure_future(self._wait(reply))
+                break
+        if self.transport is None:
+            return
+        if out:
+            self.transport.write(b"".join(out))
+        if self._eof and not self._busy:
+            self.transport.close()
+
+    async def _wait(self, reply) -> None:
+        data = await reply
+        self._busy = False
+        if self.transport is not None:
+            self.transport.write(data)
+            self._drain()
+
+
+async def serve(host: Optional[str] = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                unix: Optional[str] = None, **options: Any) -> None:
+    """Run a server until cancelled; options go to CalcServer."""
+    server = CalcServer(**options)
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except (NotImplementedError, RuntimeError):  # not available on Windows
+        pass
+    listeners = []
+    if unix is not None:
+        if os.path.exists(unix) and stat.S_ISSOCK(os.stat(unix).st_mode):
+            os.unlink(unix)  # left behind by an unclean exit
+        listeners.append(await server.start_unix(unix))
+    if host is not None:
+        listeners.append(await server.start_tcp(host, port))
+    for listener in listeners:
+        for sock in listener.sockets:
+            print(f"calc serve: listening on {sock.getsockname() or unix}", flush=True)
+    try:
+        await asyncio.gather(*(listener.serve_forever() for listener in listeners))
+    finally:
+        await server.close()
+        if unix is not None and os.path.exists(unix):
+            os.unlink(unix)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options of ``calc serve``."""
+    parser = argparse.ArgumentParser(prog='calc serve', description='Run the calculator server.')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'TCP address (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'TCP port (default: {DEFAULT_PORT})')
+    parser.add_argument('--unix', metavar='PATH', help='also listen on a Unix domain socket')
+    parser.add_argument('--no-tcp', action='store_true', help='only listen on the Unix socket')
+    parser.add_argument('--backend', choices=('float', 'decimal'), default='float')
+    parser.add_argument('--precision', type=int, help='digits for the decimal backend')
+    parser.add_argument('--workers', type=int, help='processes for heavy requests (default: CPU count)')
+    parser.add_argument('--max-sessions', type=int, default=100000,
+                        help='named sessions kept before the least recently used is dropped')
+    parser.add_argument('--metrics', metavar='FILE',
+                        help='record operation metrics and dump them to FILE (.json or Prometheus text)')
+    parser.add_argument('--metrics-interval', type=float, default=10.0, metavar='SECONDS',
+                        help='seconds between metrics dumps (default: 10)')
+    return parser
+
+
+def serve_main(argv: Optional[List[str]] = None) -> int:
+    """Run ``calc serve`` and return the exit status."""
+    args = build_parser().parse_args(argv)
+    if args.no_tcp and args.unix is None:
+        build_parser().error('--no-tcp requires --unix')
+    if args.metrics:
+        metrics.start_exporter(args.metrics, interval=args.metrics_interval)
+    try:
+        asyncio.run(serve(None if args.no_tcp else args.host, args.port, args.unix,
+                          backend=args.backend, precision=args.precision,
+                          workers=args.workers, max_sessions=args.max_sessions))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        if args.metrics:
+            metrics.stop_exporter()
+    return 0
@@ -0,0 +1,54 @@
+"""
+Per-user calculator state.
+
+A CalculatorSession is just the two numbers a calculator remembers between
+operations -- the last result and the memory register -- in a ``__slots__``
+object with no ``__dict__``, so hundreds of thousands of sessions fit in one
+process.  The math itself lives in the stateless ``calc.kernel``.
+"""
+from typing import Any
+
+from .kernel import FLOAT
+
+
+class CalculatorSession:
+    """The last result and memory register of one calculator user."""
+
+    __slots__ = ("last_result", "memory")
+
+    def __init__(self, last_result: Any = 0, memory: Any = 0) -> None:
+        self.last_result = last_result
+        self.memory = memory
+
+    def __repr__(self) -> str:
+        return f"CalculatorSession(last_result={self.last_result!r}, memory={self.memory!r})"
+
+    def clear(self) -> Any:
+        """Clear the last result."""
+        self.last_result = 0
+        return self.last_result
+
+    def memory_store(self) -> Any:
+        """Store the last result in memory."""
+        self.memory = self.last_result
+        return self.memory
+
+    def memory_recall(self) -> Any:
+        """Recall the value stored in memory."""
+        self.last_result = self.memory
+        return self.memory
+
+    def memory_clear(self) -> Any:
+        """Clear the memory."""
+        self.memory = 0
+        return self.memory
+
+    def memory_add(self, backend: Any = FLOAT) -> Any:
+        """Add last result to memory."""
+        self.memory = backend.add(self.memory, self.last_result)
+        return self.memory
+
+    def memory_subtract(self, backend: Any = FLOAT) -> Any:
+        """Subtract last result from memory."""
+        self.memory = backend.subtract(self.memory, self.last_result)
+        return self.memory
@@ -0,0 +1,68 @@
+import unittest
+from decimal import Decimal
+
+from .backends import DecimalBackend, decimal_e, decimal_pi, get_backend
+from .calculator import Calculator
+
+PI_60 = "3.14159265358979323846264338327950288419716939937510582097494"
+E_60 = "2.71828182845904523536028747135266249775724709369995957496697"
+SQRT2_60 = "1.41421356237309504880168872420969807856967187537694807317668"
+SIN1_60 = "0.841470984807896506652502321630298999622563060798371065672752"
+LN2_60 = "0.693147180559945309417232121458176568075500134360255254120680"
+
+
+class TestDecimalBackend(unittest.TestCase):
+    """Test cases for the arbitrary-precision backend."""
+
+    def setUp(self):
+        """Set up a 60-digit decimal calculator."""
+        self.calc = Calculator(backend="decimal", precision=60)
+
+    def test_constants(self):
+        """pi and e are correct to the requested precision and cached."""
+        self.assertEqual(str(decimal_pi(60)), PI_60)
+        self.assertEqual(str(decimal_e(60)), E_60)
+        self.assertIs(decimal_pi(60), decimal_pi(60))
+
+    def test_kernels(self):
+        """sqrt, sin and ln agree with published 60-digit values."""
+        self.assertEqual(str(self.calc.square_root(2)), SQRT2_60)
+        self.assertEqual(str(self.calc.sin(1)), SIN1_60)
+        self.assertEqual(str(self.calc.ln(2)), LN2_60)
+        self.assertEqual(self.calc.exp(0), 1)
+
+    def test_trig_identities(self):
+        """Argument reduction keeps large and negative angles accurate."""
+        backend = DecimalBackend(50)
+        for x in ("0.3", "-2.5", "1e6", "12345.678"):
+            s, c = backend.sin(x), backend.cos(x)
+            one = backend.add(backend.multiply(s, s), backend.multiply(c, c))
+            self.assertLess(abs(one - 1), Decimal("1e-48"))
+            self.assertLess(abs(backend.tan(x) - backend.context.divide(s, c)), Decimal("1e-45"))
+        self.assertLess(abs(backend.sin(backend.pi)), Decimal("1e-49"))
+
+    def test_calculator_semantics(self):
+        """Chaining, memory and domain errors work as with floats."""
+        self.calc.add(Decimal("0.1"), Decimal("0.2"))
+        self.assertEqual(self.calc.last_result, Decimal("0.3"))
+        self.calc.divide(1, 3)
+        self.assertEqual(str(self.calc.last_result), "0." + "3" * 60)
+        self.calc.memory_add()
+        self.assertEqual(self.calc.memory_recall(), self.calc.last_result)
+        self.assertEqual(self.calc.modulo(-7, 3), 2)
+        self.assertEqual(self.calc.factorial(30), 265252859812191058636308480000000)
+        with self.assertRaises(ZeroDivisionError):
+            self.calc.divide(0)
+        with self.assertRaises(ValueError):
+            self.calc.square_root(-1)
+
+    def test_get_backend(self):
+        """Backends are selected by name."""
+        self.assertEqual(get_backend("decimal", 30).precision, 30)
+        self.assertEqual(get_backend().name, "float")
+        with self.assertRaises(ValueError):
+            get_backend("quad")
+
+
+if __name__ == "__main__":
+    unittest.main()
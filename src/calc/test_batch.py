@@ -0,0 +1,66 @@
+import math
+import unittest
+from array import array
+
+from .batch import BatchCalculator, np
+from .calculator import Calculator
+
+
+class TestBatchCalculator(unittest.TestCase):
+    """Test cases for the vectorized batch API."""
+
+    def backends(self):
+        """Yield the pure-Python backend and, if available, the NumPy one."""
+        yield BatchCalculator(use_numpy=False)
+        if np is not None:
+            yield BatchCalculator()
+
+    def test_matches_scalar_calculator(self):
+        """Batch results agree with the scalar Calculator methods."""
+        calc = Calculator()
+        a = array("d", [1.0, 2.5, 9.0, 100.0])
+        b = array("d", [2.0, 0.5, 3.0, 4.0])
+        for batch in self.backends():
+            for name in ("add", "subtract", "multiply", "divide", "power", "modulo"):
+                result = getattr(batch, name)(a, b)
+                expected = [getattr(calc, name)(x, y) for x, y in zip(a, b)]
+                self.assertEqual(list(result.values), expected, name)
+            for name in ("square_root", "sin", "cos", "tan", "log10", "ln"):
+                result = getattr(batch, name)(a)
+                expected = [getattr(calc, name)(x) for x in a]
+                for got, want in zip(result.values, expected):
+                    self.assertAlmostEqual(got, want, places=12, msg=name)
+
+    def test_error_mask(self):
+        """Invalid elements are flagged instead of stopping the batch."""
+        for batch in self.backends():
+            result = batch.divide([1.0, 2.0, 3.0], [1.0, 0.0, 2.0])
+            self.assertEqual(list(result.errors), [0, 1, 0])
+            self.assertTrue(math.isnan(result.values[1]))
+            self.assertEqual(result.values[2], 1.5)
+            self.assertEqual(result.error_count, 1)
+
+            self.assertEqual(list(batch.square_root([4.0, -1.0]).errors), [0, 1])
+            self.assertEqual(list(batch.ln([1.0, 0.0, -2.0]).errors), [0, 1, 1])
+            self.assertEqual(list(batch.factorial([5, 2.5, 171]).errors), [0, 1, 1])
+            self.assertEqual(batch.factorial([5]).values[0], 120.0)
+
+    def test_scalar_broadcast(self):
+        """A scalar operand is applied to every element."""
+        for batch in self.backends():
+            result = batch.multiply(array("d", [1.0, 2.0, 3.0]), 2)
+            self.assertEqual(list(result.values), [2.0, 4.0, 6.0])
+            result = batch.divide(6.0, array("d", [2.0, 0.0, 3.0]))
+            self.assertEqual(list(result.errors), [0, 1, 0])
+            self.assertEqual(result.values[2], 2.0)
+
+    def test_class_attribute(self):
+        """Calculator.batch is available without an instance and is stateless."""
+        calc = Calculator()
+        calc.batch.add([1.0], [2.0])
+        self.assertEqual(calc.last_result, 0)
+        self.assertIsInstance(Calculator.batch, BatchCalculator)
+
+
+if __name__ == "__main__":
+    unittest.main()
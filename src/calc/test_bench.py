@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import unittest
+
+from .bench import BenchResult, compare, load_baseline, measure, run_cases, save_baseline
+from .bench.__main__ import main
+from .bench.suites import all_cases
+
+
+class TestBench(unittest.TestCase):
+    """Test cases for the benchmark suite and its baselines."""
+
+    def test_measure(self):
+        """A measurement has positive throughput and ordered percentiles."""
+        result = measure("noop", lambda: None, duration=0.01)
+        self.assertGreater(result.ops_per_sec, 0)
+        self.assertLessEqual(result.p50_us, result.p90_us)
+        self.assertLessEqual(result.p90_us, result.p99_us)
+
+    def test_every_suite_runs(self):
+        """Each case of the three levels runs once without errors."""
+        names = [name for name, _, _ in all_cases()]
+        for prefix in ("calculator.", "mycalc.", "gui."):
+            self.assertTrue(any(name.startswith(prefix) for name in names), prefix)
+        for name, func, ops in all_cases():
+            func()
+
+    def test_compare_flags_regressions(self):
+        """Slower throughput and larger memory beyond the threshold are regressions."""
+        old = BenchResult("case", 1000.0, 1.0, 1.0, 1.0, 100.0, 10)
+        baseline = {"case": old}
+        self.assertEqual(compare(baseline, [old._replace(ops_per_sec=950.0, p50_us=1.05)]), [])
+        slow = compare(baseline, [old._replace(ops_per_sec=800.0, p50_us=1.25)], threshold=0.1)
+        self.assertEqual([r.metric for r in slow], ["ops_per_sec", "p50_us"])
+        self.assertAlmostEqual(slow[0].change, 0.2)
+        fat = compare(baseline, [old._replace(peak_kib=200.0)])
+        self.assertEqual([r.metric for r in fat], ["peak_kib"])
+
+    def test_baseline_round_trip_and_exit_status(self):
+        """Saved baselines load back; compare exits 1 on a regression."""
+        results = run_cases(all_cases(["calculator"]), duration=0.001, pattern="calculator.add")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            save_baseline(results, path)
+            self.assertEqual(load_baseline(path), {r.name: r for r in results})
+            self.assertEqual(main(["compare", path, path]), 0)
+
+            with open(path) as f:
+                document = json.load(f)
+            for fields in document["results"].values():
+                fields["ops_per_sec"] *= 100
+            faster = os.path.join(tmp, "faster.json")
+            with open(faster, "w") as f:
+                json.dump(document, f)
+            self.assertEqual(main(["compare", faster, path]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import io
+import json
+import unittest
+
+from .cli import run_batch, run_commands
+
+
+SCRIPT = """add 2 3
+mul 4
+# comment
+
+div 1 0
+sqrt 16
+bogus 1
+exit
+add 1 1
+"""
+
+
+class TestBatchMode(unittest.TestCase):
+    """Test cases for mycalc --batch."""
+
+    def test_text_output_and_summary(self):
+        """One result per line; errors are emitted as records by default."""
+        out = io.StringIO()
+        summary = run_batch(io.StringIO(SCRIPT), out)
+        self.assertEqual(out.getvalue().splitlines(), [
+            "5.0",
+            "20.0",
+            "error line 5: Cannot divide by zero",
+            "4.0",
+            "error line 7: Unknown command: 'bogus'",
+        ])
+        self.assertEqual((summary.commands, summary.ok, summary.errors), (5, 3, 2))
+        self.assertFalse(summary.stopped)
+
+    def test_error_policies(self):
+        """skip drops failed commands, stop ends the run at the first one."""
+        out = io.StringIO()
+        run_batch(io.StringIO(SCRIPT), out, on_error='skip')
+        self.assertEqual(out.getvalue().split(), ["5.0", "20.0", "4.0"])
+
+        out = io.StringIO()
+        summary = run_batch(io.StringIO(SCRIPT), out, fmt='jsonl', on_error='stop')
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(records[-1]["type"], "ZeroDivisionError")
+        self.assertEqual(len(records), 3)
+        self.assertTrue(summary.stopped)
+
+    def test_chaining(self):
+        """Omitted operands chain on the last result."""
+        results = [r.result for r in run_commands(["add 9 0", "sqrt", "m+", "clear", "mr"])]
+        self.assertEqual(results, [9.0, 3.0, 3.0, 0, 3.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
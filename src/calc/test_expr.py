@@ -0,0 +1,54 @@
+import math
+import unittest
+
+from . import expr
+
+
+class TestExpressions(unittest.TestCase):
+    """Test cases for the expression language."""
+
+    def test_precedence(self):
+        """Operators follow the usual precedence and associativity."""
+        self.assertEqual(expr.evaluate("1 + 2 * 3"), 7)
+        self.assertEqual(expr.evaluate("(1 + 2) * 3"), 9)
+        self.assertEqual(expr.evaluate("2^3^2"), 512)
+        self.assertEqual(expr.evaluate("-2^2"), -4)
+        self.assertEqual(expr.evaluate("10 % 4 + 5!"), 122)
+
+    def test_variables_and_functions(self):
+        """Variables are bound at call time; functions match Calculator."""
+        f = expr.compile_expression("3*(x+2)^2/sin(y)")
+        self.assertEqual(f.variables, ("x", "y"))
+        self.assertAlmostEqual(f(x=1, y=0.5), 27 / math.sin(0.5))
+        self.assertAlmostEqual(f(2, 1.0), 48 / math.sin(1.0))
+        self.assertEqual(expr.evaluate("sqrt(x) + log(100) + ln(e)", x=9), 6.0)
+
+    def test_constant_folding(self):
+        """Variable-free sub-trees are evaluated at compile time."""
+        f = expr.compile_expression("2*pi*r")
+        self.assertEqual(f.source, f"lambda r: ({2 * math.pi!r} * r)")
+
+    def test_errors(self):
+        """Domain errors are raised at evaluation, syntax errors at compile."""
+        with self.assertRaises(ZeroDivisionError):
+            expr.evaluate("1 / (x - 1)", x=1)
+        with self.assertRaises(ValueError):
+            expr.evaluate("sqrt(-4)")
+        for bad in ("1 +", "foo(2)", "(1", "1 $ 2", "_x + 1"):
+            with self.assertRaises(expr.ExpressionError):
+                expr.compile_expression(bad)
+
+    def test_cache(self):
+        """Compiled forms are reused and the cache stays bounded."""
+        cache = expr.ExpressionCache(maxsize=2)
+        first = cache.get("x + 1")
+        self.assertIs(cache.get("x + 1"), first)
+        cache.get("x + 2")
+        cache.get("x + 3")
+        info = cache.info()
+        self.assertEqual((info.hits, info.misses, info.size), (1, 3, 2))
+        self.assertIsNot(cache.get("x + 1"), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
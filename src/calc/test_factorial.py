@@ -0,0 +1,55 @@
+import math
+import unittest
+
+from .backends import DecimalBackend
+from .calculator import Calculator
+from .factorial import (FactorialResult, _parallel_factorial, factorial,
+                        leading_digits, log_factorial)
+
+
+class TestFactorial(unittest.TestCase):
+    """Test cases for the large-n factorial engine."""
+
+    def test_exact_values(self):
+        """Small and medium factorials are exact ints."""
+        self.assertEqual(factorial(0), 1)
+        self.assertEqual(factorial(20), math.factorial(20))
+        self.assertEqual(factorial(3000), math.factorial(3000))
+        self.assertIsInstance(factorial(5), FactorialResult)
+
+    def test_parallel_product(self):
+        """The process-pool split gives the same product."""
+        self.assertEqual(_parallel_factorial(5000, 2), math.factorial(5000))
+
+    def test_no_float_overflow(self):
+        """Factorials past 170 keep the session usable and chain on ln."""
+        calc = Calculator()
+        result = calc.factorial(20000)
+        self.assertEqual(calc.last_result, result)
+        self.assertAlmostEqual(calc.ln(), math.lgamma(20001), places=6)
+        self.assertEqual(result.to_float(), math.inf)
+
+    def test_lazy_string(self):
+        """str() of a huge result is abbreviated; exact digits on request."""
+        result = factorial(20000)
+        self.assertEqual(result.digits, 77338)
+        self.assertTrue(str(result).startswith("1.81920632023035e+77337"))
+        self.assertEqual(len(result.to_decimal_string()), 77338)
+        self.assertEqual(str(factorial(10)), "3628800")
+        self.assertEqual(leading_digits(123456789, 3), "1.23e+8")
+
+    def test_log_factorial(self):
+        """lgamma for floats and Stirling for decimals agree with exact values."""
+        self.assertAlmostEqual(log_factorial(1000), math.log(math.factorial(1000)))
+        backend = DecimalBackend(40)
+        exact = backend.context.ln(math.factorial(500))
+        stirling = log_factorial(500, backend)
+        self.assertEqual(stirling, exact)
+        calc = Calculator()
+        self.assertAlmostEqual(calc.log_factorial(10 ** 6), 12815518.384658169)
+        with self.assertRaises(ValueError):
+            log_factorial(-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import math
+import unittest
+
+from .calculator import Calculator
+from .memo import MISSING, LFUCache, LRUCache, make_cache
+
+
+class TestCaches(unittest.TestCase):
+    """Test cases for the LRU and LFU caches."""
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted first."""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIs(cache.get("b"), MISSING)
+        self.assertEqual(cache.get("a"), 1)
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.evictions, stats.size), (2, 1, 1, 2))
+
+    def test_lfu_eviction(self):
+        """The least frequently used entry is evicted first."""
+        cache = LFUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        cache.put("c", 3)
+        self.assertIs(cache.get("b"), MISSING)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.stats().evictions, 1)
+
+    def test_unknown_policy(self):
+        """Only lru and lfu are accepted."""
+        with self.assertRaises(ValueError):
+            make_cache("fifo")
+
+
+class TestMemoizedCalculator(unittest.TestCase):
+    """Cached and uncached calculators must behave identically."""
+
+    def test_identical_results(self):
+        """Results and last_result match with and without the cache."""
+        plain = Calculator()
+        for policy in ("lru", "lfu"):
+            cached = Calculator()
+            cached.enable_memoization(maxsize=4, policy=policy)
+            for _ in range(3):
+                for x in (0.5, 2, 2.0, -0.0, 0.0, 10):
+                    for name in ("sin", "cos", "tan"):
+                        want = getattr(plain, name)(x)
+                        got = getattr(cached, name)(x)
+                        self.assertEqual(repr(got), repr(want))
+                        self.assertEqual(repr(cached.last_result), repr(plain.last_result))
+                    self.assertEqual(repr(cached.power(x, 3)), repr(plain.power(x, 3)))
+                self.assertEqual(cached.factorial(20), plain.factorial(20))
+                self.assertEqual(cached.last_result, plain.last_result)
+            cached.sin(0.5)
+            cached.sin(0.5)
+            stats = cached.memo_stats()
+            self.assertGreater(stats.hits, 0)
+            self.assertGreater(stats.evictions, 0)
+            self.assertLessEqual(stats.size, 4)
+
+    def test_errors_not_cached(self):
+        """Domain errors are raised on every call and leave last_result alone."""
+        calc = Calculator()
+        calc.enable_memoization()
+        calc.add(7, 0)
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                calc.ln(-1)
+            self.assertEqual(calc.last_result, 7)
+        self.assertEqual(calc.ln(math.e), 1.0)
+        calc.disable_memoization()
+        self.assertIsNone(calc.memo_stats())
+
+
+if __name__ == "__main__":
+    unittest.main()
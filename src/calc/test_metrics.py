@@ -0,0 +1,73 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from . import metrics, stats
+from .calculator import Calculator
+from .cli import run_batch
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for the opt-in operation metrics."""
+
+    def setUp(self):
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.disable()
+        metrics.reset()
+
+    def test_disabled_restores_originals(self):
+        """Disabled metrics leave the original methods in place and count nothing."""
+        original = Calculator.__dict__["divide"]
+        metrics.enable()
+        self.assertIsNot(Calculator.__dict__["divide"], original)
+        metrics.disable()
+        self.assertIs(Calculator.__dict__["divide"], original)
+        Calculator().divide(1, 2)
+        self.assertEqual(stats(), {})
+
+    def test_counts_and_errors(self):
+        """Calls, error types and the latency histogram are recorded per operation."""
+        metrics.enable()
+        calc = Calculator()
+        calc.divide(1, 2)
+        with self.assertRaises(ZeroDivisionError):
+            calc.divide(1, 0)
+        with self.assertRaises(ValueError):
+            calc.square_root(-1)
+        snapshot = stats()
+        self.assertEqual(snapshot["calculator.divide"]["calls"], 2)
+        self.assertEqual(snapshot["calculator.divide"]["errors"], {"ZeroDivisionError": 1})
+        self.assertEqual(snapshot["calculator.square_root"]["error_count"], 1)
+        self.assertEqual(snapshot["calculator.divide"]["buckets"]["+Inf"], 2)
+
+    def test_dispatcher_metrics(self):
+        """Batch commands are counted under their main command name."""
+        metrics.enable()
+        run_batch(io.StringIO("plus 1 2\nadd 3\nbogus\n"), io.StringIO())
+        snapshot = stats()
+        self.assertEqual(snapshot["mycalc.add"]["calls"], 2)
+        self.assertEqual(snapshot["mycalc.unknown"]["errors"], {"LookupError": 1})
+
+    def test_exposition(self):
+        """Prometheus and JSON dumps are written atomically to a file."""
+        metrics.enable()
+        Calculator().add(1, 2)
+        text = metrics.to_prometheus()
+        self.assertIn('calc_operation_calls_total{operation="calculator.add"} 1', text)
+        self.assertIn('calc_operation_seconds_bucket{operation="calculator.add",le="+Inf"} 1', text)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.json")
+            metrics.start_exporter(path, interval=60)
+            metrics.stop_exporter()
+            with open(path) as f:
+                document = json.load(f)
+            self.assertEqual(document["operations"]["calculator.add"]["calls"], 1)
+            self.assertEqual(os.listdir(tmp), ["metrics.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
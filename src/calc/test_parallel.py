@@ -0,0 +1,64 @@
+import io
+import os
+import tempfile
+import unittest
+
+from .cli import run_batch
+from .parallel import evaluate_file, run_file, split_chunks, starts_chain
+
+SCRIPT = "".join(f"add {i} 1\nmul 2\nsqrt\n\ndiv {i} 0\nlog {i}\n" for i in range(200))
+
+
+class TestParallel(unittest.TestCase):
+    """Test cases for the multi-process batch evaluator."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(fd, "w") as f:
+            f.write(SCRIPT)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_chunks_split_on_chains(self):
+        """Chunks only start where a chain starts and cover every line."""
+        chunks = list(split_chunks(io.BytesIO(SCRIPT.encode()), chunk_bytes=50))
+        self.assertGreater(len(chunks), 10)
+        for first_line, start, end, data in chunks:
+            self.assertTrue(starts_chain(data.split(b"\n")[0]))
+            self.assertEqual(end - start, len(data))
+            self.assertEqual(SCRIPT.splitlines()[first_line - 1], data.split(b"\n")[0].decode())
+        self.assertEqual(b"".join(c[3] for c in chunks), SCRIPT.encode())
+
+    def test_matches_sequential(self):
+        """Results come back in input order, identical to the single-process run."""
+        expected = io.StringIO()
+        run_batch(io.StringIO(SCRIPT), expected, fmt='jsonl')
+        for jobs in (1, 2):
+            out = io.StringIO()
+            summary = run_file(self.path, out, jobs=jobs, fmt='jsonl', chunk_bytes=64)
+            self.assertEqual(out.getvalue(), expected.getvalue())
+            self.assertEqual((summary.commands, summary.errors), (1000, 201))
+
+    def test_per_chunk_errors_and_stop(self):
+        """Each chunk reports its own errors; stop ends the run at the first one."""
+        results = list(evaluate_file(self.path, jobs=1, chunk_bytes=64))
+        self.assertEqual(sum(r.summary.errors for r in results), 201)
+        self.assertTrue(all(r.failure is None for r in results))
+        stopped = list(evaluate_file(self.path, jobs=2, on_error='stop', chunk_bytes=64))
+        self.assertTrue(stopped[-1].summary.stopped)
+        self.assertEqual(stopped[-1].output.splitlines()[-1], "error line 5: Cannot divide by zero")
+
+    def test_exit_and_expressions(self):
+        """exit ends the run; expression lines are independent."""
+        source = io.BytesIO(b"add 1 2\nexit\nadd 3 4\n")
+        results = list(evaluate_file("-", jobs=1, chunk_bytes=4, source=source))
+        self.assertEqual([r.output for r in results], ["3.0\n"])
+        source = io.BytesIO(b"2^10\nsqrt(16)\n1/0\n")
+        out = "".join(r.output for r in evaluate_file("-", jobs=1, expressions=True,
+                                                      chunk_bytes=4, source=source))
+        self.assertEqual(out, "1024.0\n4.0\nerror line 3: Cannot divide by zero\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import math
+import os
+import socket
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from . import server as server_module
+from .server import CalcServer
+
+
+async def _exchange(reader, writer, *frames):
+    writer.write(b"".join(json.dumps(frame).encode() + b"\n" for frame in frames))
+    await writer.drain()
+    return [json.loads(await reader.readline()) for _ in frames]
+
+
+class TestServer(unittest.TestCase):
+    """Test cases for the NDJSON calculator server."""
+
+    def run_server(self, client, **options):
+        async def main():
+            server = CalcServer(executor=ThreadPoolExecutor(2), **options)
+            listener = await server.start_tcp("127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                return await client(server, port)
+            finally:
+                await server.close()
+        return asyncio.run(main())
+
+    def test_pipelined_requests(self):
+        """Pipelined requests are answered in order and chain on the connection session."""
+        async def client(server, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            replies = await _exchange(reader, writer,
+                                      {"id": 1, "op": "add", "args": [2, 3]},
+                                      {"id": 2, "op": "sqrt"},
+                                      {"id": 3, "op": "divide", "args": [1, 0]},
+                                      {"id": 4, "op": "bogus"},
+                                      {"id": 5, "op": "m+"})
+            writer.close()
+            return replies
+
+        replies = self.run_server(client)
+        self.assertEqual([r["id"] for r in replies], [1, 2, 3, 4, 5])
+        self.assertEqual(replies[0]["result"], 5)
+        self.assertEqual(replies[1]["result"], math.sqrt(5))
+        self.assertEqual(replies[2]["type"], "ZeroDivisionError")
+        self.assertEqual(replies[3]["type"], "LookupError")
+        self.assertEqual(replies[4]["result"], math.sqrt(5))
+
+    def test_batch_and_named_sessions(self):
+        """A list frame gets a list reply; named sessions are shared across connections."""
+        async def client(server, port):
+            first = await asyncio.open_connection("127.0.0.1", port)
+            second = await asyncio.open_connection("127.0.0.1", port)
+            batch, = await _exchange(*first, [{"op": "add", "args": [1, 2], "session": "s"},
+                                              {"op": "mul", "args": [10], "session": "s"}])
+            shared, = await _exchange(*second, {"op": "result", "session": "s"})
+            own, = await _exchange(*second, {"op": "result"})
+            for _, writer in (first, second):
+                writer.close()
+            return batch, shared, own
+
+        batch, shared, own = self.run_server(client)
+        self.assertEqual([r["result"] for r in batch], [3, 30])
+        self.assertEqual(shared["result"], 30)
+        self.assertEqual(own["result"], 0)
+
+    def test_heavy_request_in_executor(self):
+        """Large factorials leave the event loop but keep reply order."""
+        async def client(server, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            replies = await _exchange(reader, writer,
+                                      {"id": "big", "op": "fact", "args": [30]},
+                                      {"op": "ln"},
+                                      [{"op": "fact", "args": [25]}, {"op": "fact", "args": [-1]},
+                                       {"op": "result"}],
+                                      {"id": "after", "op": "lfact", "args": [30]})
+            writer.close()
+            return replies
+
+        old = server_module.HEAVY_FACTORIAL
+        server_module.HEAVY_FACTORIAL = 20
+        try:
+            replies = self.run_server(client)
+        finally:
+            server_module.HEAVY_FACTORIAL = old
+        self.assertEqual(replies[0]["result"], str(math.factorial(30)))
+        self.assertAlmostEqual(replies[1]["result"], math.lgamma(31))
+        self.assertEqual(replies[2][0]["result"], str(math.factorial(25)))
+        self.assertEqual(replies[2][1]["type"], "ValueError")
+        self.assertEqual(replies[2][2]["result"], float(math.factorial(25)))
+        self.assertEqual(replies[3]["id"], "after")
+        self.assertAlmostEqual(replies[3]["result"], math.lgamma(31))
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets not available")
+    def test_unix_socket(self):
+        """The same protocol works over a Unix domain socket."""
+        async def main():
+            server = CalcServer(backend="decimal", precision=30)
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "calc.sock")
+                await server.start_unix(path)
+                try:
+                    reader, writer = await asyncio.open_unix_connection(path)
+                    reply, = await _exchange(reader, writer, {"op": "div", "args": [1, 3]})
+                    writer.close()
+                finally:
+                    await server.close()
+            return reply
+
+        self.assertEqual(asyncio.run(main())["result"], "0." + "3" * 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
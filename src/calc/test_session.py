@@ -0,0 +1,61 @@
+import math
+import threading
+import unittest
+
+from . import kernel
+from .calculator import Calculator
+from .session import CalculatorSession
+
+
+class TestSession(unittest.TestCase):
+    """Test cases for the stateless kernel and the slotted session."""
+
+    def test_no_instance_dict(self):
+        """Sessions and calculators carry no per-instance __dict__."""
+        self.assertFalse(hasattr(CalculatorSession(), "__dict__"))
+        self.assertFalse(hasattr(Calculator(), "__dict__"))
+        with self.assertRaises(AttributeError):
+            CalculatorSession().extra = 1
+
+    def test_kernel_is_pure(self):
+        """Kernel functions return results and raise the calculator's errors."""
+        self.assertEqual(kernel.divide(10, 4), 2.5)
+        self.assertEqual(kernel.factorial(5), 120)
+        with self.assertRaises(ZeroDivisionError):
+            kernel.modulo(1, 0)
+        with self.assertRaises(ValueError):
+            kernel.ln(0)
+
+    def test_wrap_session(self):
+        """A calculator operates on the session it is given."""
+        session = CalculatorSession(last_result=10)
+        calc = Calculator(session=session)
+        calc.add(5)
+        calc.memory_store()
+        self.assertEqual((session.last_result, session.memory), (15, 15))
+        self.assertIs(calc.session, session)
+        other = Calculator(session=session)
+        self.assertEqual(other.multiply(2), 30)
+        self.assertEqual(calc.last_result, 30)
+
+    def test_shared_kernel_across_threads(self):
+        """Many sessions driven concurrently through one kernel stay independent."""
+        sessions = [CalculatorSession() for _ in range(8)]
+
+        def work(index):
+            calc = Calculator(session=sessions[index])
+            for _ in range(1000):
+                calc.add(index)
+            calc.square_root()
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for index, session in enumerate(sessions):
+            self.assertEqual(session.last_result, math.sqrt(1000 * index))
+
+
+if __name__ == "__main__":
+    unittest.main()